@@ -0,0 +1,149 @@
+"""
+Primary/replica database routing.
+
+Reads are only sent to the replicas in settings.DATABASE_REPLICAS while a view
+has opted in with ReplicaReadsMixin, so admin, management commands and signal
+handlers always see the primary. Once a request writes, the rest of it reads
+from the primary, and PrimaryPinMiddleware keeps the client on the primary
+for REPLICA_PIN_SECONDS so that it sees its own writes despite replication
+lag.
+
+Caches are invalidated when the primary commits, so a request reading from a
+lagging replica right after can still see the old rows. Whatever it caches is
+kept for at most REPLICA_PIN_SECONDS, see cache_timeout().
+"""
+
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = "primary_pin"
+
+
+@dataclass
+class RoutingState:
+    # Set when the view serving the request may read from a replica.
+    replica_reads: bool = False
+    # Set when reads must go to the primary, after a write or for a pinned
+    # client.
+    pinned: bool = False
+    wrote: bool = False
+    # Set once a read has been sent to a replica.
+    read_replica: bool = False
+
+
+_state = ContextVar("database_routing", default=None)
+
+
+def routing_state():
+    return _state.get()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.replica_reads
+            or state.pinned
+            or not settings.DATABASE_REPLICAS
+            # Reads inside a transaction must see its uncommitted writes.
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        state.read_replica = True
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+
+class PrimaryPinMiddleware:
+    """
+    Track the routing state of each request and pin clients that wrote.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request):
+        # The async ORM runs queries in threads with a copy of this context,
+        # which shares the same RoutingState instance.
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.process_response(state, response)
+
+    def process_response(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def cache_timeout(timeout):
+    """
+    The TTL for a cache entry built by the current request: `timeout`, capped
+    at REPLICA_PIN_SECONDS once the request has read from a replica.
+    """
+    state = _state.get()
+    if state is None or not state.read_replica:
+        return timeout
+    if timeout is None:
+        return settings.REPLICA_PIN_SECONDS
+    return min(timeout, settings.REPLICA_PIN_SECONDS)
+
+
+def allow_replica_reads(request):
+    """
+    Let the rest of a safe (read-only) request read from the replicas.
+    """
+    state = _state.get()
+    if state is not None and request.method in SAFE_METHODS:
+        state.replica_reads = True
+
+
+class ReplicaReadsMixin:
+    """
+    Let the safe requests of an APIView read from the replicas.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        allow_replica_reads(request)
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class ProductConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "drfecommerce.product"
+
+    def ready(self):
+        from . import (  # noqa: F401
+            cache,
+            documents,
+            facets,
+            search,
+            signals,
+            skus,
+            summaries,
+        )
+
+        # Evict cached responses only once the documents, indexes and
+        # summaries they are built from have been rebuilt; receivers run in
+        # the order they are connected.
+        signals.catalog_changed.connect(cache.invalidate_products)
@@ -0,0 +1,155 @@
+"""
+ASGI-native variants of the catalog read endpoints.
+
+DRF views are synchronous, so under ASGI each of their requests holds a
+worker thread for its whole duration. These plain Django async views return
+the same bodies and validators as their ProductViewSet/CategoryViewSet
+counterparts but only leave the event loop for individual queries, and for
+serialization, which is offloaded to a thread pool. The response cache is
+not used here; the product endpoints are served from stored documents in a
+single query, or, with `?fields=`/`?expand=`, serialized from the fieldset's
+query plan like the sync endpoints.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from ..db import allow_replica_reads
+from .conditional import (
+    add_validators,
+    facet_page_validators,
+    listing_aggregates,
+    listing_state_validators,
+    make_etag,
+    precondition_response,
+)
+from .documents import (
+    adocuments_for,
+    document_response,
+    paginated_document_response,
+    with_document_version,
+    with_documents,
+)
+from .facets import facet_counts, filter_products, parse_attr_filters, wants_facets
+from .fieldsets import apply_fieldset, parse_fieldset
+from .filters import filter_listing, parse_listing_filters
+from .models import Category, Product
+from .pagination import ProductCursorPagination
+from .renderers import CatalogJSONRenderer
+from .serializers import CategorySerializer, serialize_product_fields
+
+
+def render_categories(categories):
+    return CatalogJSONRenderer().render(CategorySerializer(categories, many=True).data)
+
+
+def render_product_fields(products, fields):
+    return CatalogJSONRenderer().render(
+        [serialize_product_fields(product, fields) for product in products]
+    )
+
+
+def render_product_fields_page(paginator, page, fields, facets):
+    response = paginator.get_paginated_response(
+        [serialize_product_fields(product, fields) for product in page]
+    )
+    if facets is not None:
+        response.data["facets"] = facets
+    return CatalogJSONRenderer().render(response.data)
+
+
+def error_response(exc):
+    # Same body as DRF's exception handler gives the sync endpoints.
+    detail = exc.detail
+    if not isinstance(detail, (list, dict)):
+        detail = {"detail": detail}
+    return JsonResponse(detail, status=exc.status_code, safe=False)
+
+
+def json_response(content):
+    return HttpResponse(content, content_type="application/json")
+
+
+@require_safe
+async def category_list(request):
+    allow_replica_reads(request)
+    queryset = Category.objects.is_active()
+    state = await queryset.aaggregate(**listing_aggregates("updated_at"))
+    etag, last_modified = listing_state_validators(request, state)
+
+    response = precondition_response(request, etag, last_modified)
+    if response is None:
+        categories = [category async for category in queryset]
+        content = await sync_to_async(render_categories, thread_sensitive=False)(
+            categories
+        )
+        response = json_response(content)
+    return add_validators(request, response, etag, last_modified)
+
+
+@require_safe
+async def product_list(request):
+    allow_replica_reads(request)
+    paginator = ProductCursorPagination()
+    try:
+        queryset = filter_listing(
+            Product.objects.is_active(), parse_listing_filters(request.GET)
+        )
+        queryset = filter_products(queryset, parse_attr_filters(request.GET))
+        fields = parse_fieldset(request.GET)
+        if fields is None:
+            page_queryset = with_documents(queryset.only(*paginator.cursor_fields))
+        else:
+            page_queryset = with_document_version(apply_fieldset(queryset, fields))
+        # The paginator reads query_params, which only DRF's Request provides.
+        page = await paginator.apaginate_queryset(page_queryset, Request(request))
+    except APIException as exc:
+        return error_response(exc)
+    facets = None
+    if wants_facets(request.GET):
+        facets = await sync_to_async(facet_counts)(queryset)
+    etag, last_modified = facet_page_validators(request, paginator, page, facets)
+
+    response = precondition_response(request, etag, last_modified)
+    if response is None and fields is not None:
+        content = await sync_to_async(render_product_fields_page)(
+            paginator, page, fields, facets
+        )
+        response = json_response(content)
+    elif response is None:
+        documents = await adocuments_for(page)
+        response = paginated_document_response(paginator, documents, facets)
+    return add_validators(request, response, etag, last_modified)
+
+
+@require_safe
+async def product_detail(request, slug):
+    allow_replica_reads(request)
+    try:
+        fields = parse_fieldset(request.GET)
+    except APIException as exc:
+        return error_response(exc)
+    queryset = Product.objects.is_active().filter(slug=slug)
+    if fields is None:
+        queryset = with_documents(queryset.only("pk"))
+    else:
+        queryset = with_document_version(apply_fieldset(queryset, fields))
+    product = await queryset.afirst()
+    if product is None:
+        return document_response([])
+
+    etag = None
+    last_modified = product.document_updated_at
+    if last_modified is not None:
+        etag = make_etag(request, slug, last_modified.isoformat())
+
+    response = precondition_response(request, etag, last_modified)
+    if response is None and fields is not None:
+        content = await sync_to_async(render_product_fields)([product], fields)
+        response = json_response(content)
+    elif response is None:
+        response = document_response(await adocuments_for([product]))
+    return add_validators(request, response, etag, last_modified)
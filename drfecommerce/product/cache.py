@@ -0,0 +1,187 @@
+import hashlib
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from ..db import cache_timeout
+from .models import Category, Product
+
+
+def catalog_cache():
+    return caches[settings.CATALOG_CACHE]
+
+
+def group_key(group):
+    digest = hashlib.md5(group.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"group:{digest}"
+
+
+def group_versions(cache, groups):
+    """
+    Return the current version token of each invalidation group.
+
+    Versions are random rather than counters, so a version key that is evicted
+    can never bring back entries cached under an older version.
+    """
+    keys = [group_key(group) for group in groups]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = cache.get_or_set(key, uuid.uuid4().hex, timeout=None)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*groups):
+    """
+    Evict every response cached under any of the given groups once the current
+    transaction commits.
+
+    Bumping the versions earlier would let a request on another connection
+    read the old rows and cache them under the new versions, where they would
+    outlive the change.
+    """
+    versions = {group_key(group): uuid.uuid4().hex for group in groups}
+    transaction.on_commit(
+        lambda: catalog_cache().set_many(versions, timeout=None), robust=True
+    )
+
+
+def response_key(cache, endpoint, request, groups):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(query.encode("utf-8"), usedforsecurity=False).hexdigest()
+    versions = ".".join(group_versions(cache, groups))
+    return f"response:{endpoint}:{request.accepted_renderer.format}:{versions}:{digest}"
+
+
+def cache_response(*groups, timeout=None):
+    """
+    Cache a successful response of a ViewSet action in the catalog cache.
+
+    `groups` are invalidation group names formatted with the view kwargs, e.g.
+    "product:{slug}". Invalidating any of them evicts the entry. `timeout`
+    overrides the cache's default TTL for this endpoint.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if request.accepted_renderer.format == "api":
+                return func(self, request, *args, **kwargs)
+
+            cache = catalog_cache()
+            endpoint = f"{type(self).__name__}.{func.__name__}"
+            names = [group.format(**kwargs) for group in groups]
+            key = response_key(cache, endpoint, request, names)
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, etag, last_modified = cached
+                response = HttpResponse(content, content_type=content_type)
+                if etag:
+                    response.headers["ETag"] = etag
+                if last_modified:
+                    response.headers["Last-Modified"] = last_modified
+                return get_conditional_response(
+                    request,
+                    etag=etag,
+                    last_modified=parse_http_date_safe(last_modified),
+                    response=response,
+                )
+
+            response = func(self, request, *args, **kwargs)
+            # 304s and errors are not cached.
+            if response.status_code != 200:
+                return response
+            if isinstance(response, Response):
+                response.accepted_renderer = request.accepted_renderer
+                response.accepted_media_type = request.accepted_media_type
+                response.renderer_context = self.get_renderer_context()
+                response.render()
+
+            value = (
+                response.content,
+                response["Content-Type"],
+                response.get("ETag"),
+                response.get("Last-Modified"),
+            )
+            ttl = cache.default_timeout if timeout is None else timeout
+            cache.set(key, value, cache_timeout(ttl))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def category_groups(category_ids):
+    """
+    Groups of the given categories and of all their ancestors, whose subtree
+    listings include the categories' products.
+    """
+    ancestors = Q()
+    for tree_id, lft, rght in Category.objects.filter(pk__in=category_ids).values_list(
+        "tree_id", "lft", "rght"
+    ):
+        ancestors |= Q(tree_id=tree_id, lft__lte=lft, rght__gte=rght)
+    if not ancestors:
+        return set()
+    slugs = Category.objects.filter(ancestors).values_list("slug", flat=True)
+    return {f"category:{slug}" for slug in slugs}
+
+
+# Connected in ProductConfig.ready(), after the receivers that rebuild the
+# documents and indexes responses are built from.
+def invalidate_products(sender, product_ids, **kwargs):
+    rows = Product.objects.filter(pk__in=product_ids).values_list("slug", "category_id")
+    groups = {"products"}
+    category_ids = set()
+    for slug, category_id in rows:
+        groups.add(f"product:{slug}")
+        category_ids.add(category_id)
+    invalidate(*groups, *category_groups(category_ids))
+
+
+@receiver(pre_save, sender=Product)
+def invalidate_moved_product(sender, instance, raw=False, **kwargs):
+    """
+    Evict the listings a product is leaving when its slug or category changes.
+    """
+    if raw or instance.pk is None:
+        return
+    previous = (
+        Product.objects.filter(pk=instance.pk)
+        .values_list("slug", "category_id")
+        .first()
+    )
+    if previous is None:
+        return
+    slug, category_id = previous
+    if slug != instance.slug or category_id != instance.category_id:
+        invalidate(f"product:{slug}", *category_groups([category_id]))
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_deleted_product(sender, instance, **kwargs):
+    invalidate(
+        "products",
+        f"product:{instance.slug}",
+        *category_groups([instance.category_id]),
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    # Any insert, move or delete can reshape other categories' subtrees.
+    invalidate("categories", "category-tree")
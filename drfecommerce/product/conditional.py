@@ -0,0 +1,140 @@
+import hashlib
+import json
+from calendar import timegm
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import ProductDocument
+
+
+def make_etag(request, *parts):
+    """
+    Build an ETag from the resource version and the request's query string, so
+    that different pages of the same listing never share a validator.
+    """
+    raw = "|".join(str(part) for part in (*parts, request.META.get("QUERY_STRING")))
+    return hashlib.md5(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def conditional(validators):
+    """
+    Honor If-None-Match / If-Modified-Since on a ViewSet action.
+
+    `validators(view, request, **kwargs)` returns an `(etag, last_modified)`
+    pair. When the client's copy is current a 304 is returned before the action
+    runs; otherwise the validators are sent with the response. This mirrors
+    django.views.decorators.http.condition for methods that need the view.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            etag, last_modified = validators(self, request, **kwargs)
+            response = precondition_response(request, etag, last_modified)
+            if response is None:
+                response = func(self, request, *args, **kwargs)
+            return add_validators(request, response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
+
+
+def precondition_response(request, etag, last_modified):
+    """
+    Return the 304 (or 412) response for a client whose copy is current.
+    """
+    return get_conditional_response(
+        request, etag=etag and quote_etag(etag), last_modified=timestamp(last_modified)
+    )
+
+
+def add_validators(request, response, etag, last_modified):
+    if request.method in ("GET", "HEAD") and response.status_code == 200:
+        if etag is not None and not response.has_header("ETag"):
+            response.headers["ETag"] = quote_etag(etag)
+        if last_modified is not None and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(timestamp(last_modified))
+    return response
+
+
+def timestamp(last_modified):
+    return timegm(last_modified.utctimetuple()) if last_modified else None
+
+
+def listing_aggregates(field):
+    # The row count changes when an item leaves the listing without touching
+    # the timestamp of any remaining item.
+    return {"last_modified": Max(field), "count": Count("pk")}
+
+
+def listing_validators(request, queryset, field):
+    state = queryset.aggregate(**listing_aggregates(field))
+    return listing_state_validators(request, state)
+
+
+def listing_state_validators(request, state):
+    if state["last_modified"] is None:
+        return None, None
+    etag = make_etag(request, state["count"], state["last_modified"].isoformat())
+    return etag, state["last_modified"]
+
+
+def category_list_validators(view, request, **kwargs):
+    return listing_validators(request, view.queryset.all(), "updated_at")
+
+
+def product_list_validators(view, request, slug=None, **kwargs):
+    # A keyset page is fully described by its rows, their documents and whether
+    # there is a page on either side, so the validators come from the page
+    # query itself instead of an aggregate over the whole listing.
+    queryset = view.get_list_queryset(request, slug)
+    paginator, page = view.get_page(request, queryset)
+    return facet_page_validators(
+        request, paginator, page, view.get_facets(request, queryset)
+    )
+
+
+def page_validators(request, paginator, page):
+    """
+    Validators of a keyset page loaded with a `document_updated_at` annotation.
+    """
+    if not page:
+        return None, None
+    updated = [product.document_updated_at for product in page]
+    etag = make_etag(
+        request,
+        paginator.has_next,
+        paginator.has_previous,
+        *(f"{product.pk}:{product.document_updated_at}" for product in page),
+    )
+    # Products without a document yet are rendered now, so their time is unknown.
+    last_modified = None if None in updated else max(updated)
+    return etag, last_modified
+
+
+def facet_page_validators(request, paginator, page, facets):
+    """
+    Validators of a keyset page sent with the facet counts of its listing, or
+    without them when `facets` is None.
+    """
+    etag, last_modified = page_validators(request, paginator, page)
+    if etag is None or facets is None:
+        return etag, last_modified
+    # The counts cover the whole listing rather than the page, so they are part
+    # of the ETag and no page row dates the response.
+    return make_etag(request, etag, json.dumps(facets, sort_keys=True)), None
+
+
+def product_validators(view, request, slug=None, **kwargs):
+    updated_at = (
+        ProductDocument.objects.filter(product__in=view.queryset.filter(slug=slug))
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None, None
+    return make_etag(request, slug, updated_at.isoformat()), updated_at
@@ -0,0 +1,116 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+from .models import Product, ProductDocument
+from .renderers import CatalogJSONRenderer
+from .serializers import serialize_product
+from .signals import catalog_changed
+
+
+def render_product_document(product):
+    """
+    Render a product exactly as the product endpoints return it.
+    """
+    return CatalogJSONRenderer().render(serialize_product(product)).decode("utf-8")
+
+
+def rebuild_product_documents(product_ids):
+    """
+    Recompute and store the documents for the given products.
+
+    Returns a mapping of product id to the rendered document. The products are
+    read from the primary, so that a lagging replica cannot overwrite a newer
+    document.
+    """
+    products = (
+        Product.objects.db_manager(DEFAULT_DB_ALIAS)
+        .filter(pk__in=set(product_ids))
+        .for_api()
+    )
+    documents = [
+        ProductDocument(product=product, document=render_product_document(product))
+        for product in products
+    ]
+    ProductDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["product"],
+        update_fields=["document", "updated_at"],
+    )
+    return {doc.product_id: doc.document for doc in documents}
+
+
+def with_documents(queryset):
+    """
+    Annotate a Product queryset with its stored document and the document's
+    update time, in the same query.
+    """
+    return with_document_version(queryset).annotate(
+        document_json=F("document__document")
+    )
+
+
+def with_document_version(queryset):
+    """
+    Annotate a Product queryset with its stored document's update time, which
+    changes whenever anything in the product's representation does.
+    """
+    return queryset.annotate(document_updated_at=F("document__updated_at"))
+
+
+def documents_for(products):
+    """
+    Return the stored documents for products loaded through with_documents(),
+    building any that are missing, in the order the products were given.
+    """
+    missing = [p.pk for p in products if p.document_json is None]
+    built = rebuild_product_documents(missing) if missing else {}
+    return merge_documents(products, built)
+
+
+async def adocuments_for(products):
+    missing = [p.pk for p in products if p.document_json is None]
+    built = await sync_to_async(rebuild_product_documents)(missing) if missing else {}
+    return merge_documents(products, built)
+
+
+def merge_documents(products, built):
+    return [
+        p.document_json if p.document_json is not None else built[p.pk]
+        for p in products
+    ]
+
+
+def document_response(documents):
+    body = "[" + ",".join(documents) + "]"
+    return HttpResponse(body.encode("utf-8"), content_type="application/json")
+
+
+def paginated_document_response(paginator, documents, facets=None):
+    envelope = json.dumps(
+        {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+        },
+        separators=(",", ":"),
+    )
+    body = envelope[:-1] + ',"results":[' + ",".join(documents) + "]"
+    if facets is not None:
+        body += ',"facets":' + json.dumps(facets, separators=(",", ":"))
+    body += "}"
+    return HttpResponse(body.encode("utf-8"), content_type="application/json")
+
+
+def results_document_response(documents):
+    body = '{"results":[' + ",".join(documents) + "]}"
+    return HttpResponse(body.encode("utf-8"), content_type="application/json")
+
+
+@receiver(catalog_changed)
+def rebuild_changed_documents(sender, product_ids, **kwargs):
+    rebuild_product_documents(product_ids)
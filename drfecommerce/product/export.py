@@ -0,0 +1,35 @@
+"""
+Streaming catalog export as JSON Lines (NDJSON).
+
+Products are read with QuerySet.iterator(), together with their stored
+documents, and emitted a chunk at a time. Documents missing from a chunk are
+built with one for_api() prefetch for that chunk, so memory use is bounded
+by the chunk size rather than by the catalog size.
+"""
+
+from itertools import islice
+
+from .documents import documents_for, with_documents
+from .models import Product
+
+CHUNK_SIZE = 500
+
+
+def export_queryset():
+    return Product.objects.is_active()
+
+
+def ndjson_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yield one string per chunk of products, holding one document per line.
+    """
+    products = (
+        with_documents(queryset.only("pk"))
+        .order_by("pk")
+        .iterator(chunk_size=chunk_size)
+    )
+    while True:
+        chunk = list(islice(products, chunk_size))
+        if not chunk:
+            return
+        yield "".join(f"{document}\n" for document in documents_for(chunk))
@@ -0,0 +1,113 @@
+"""
+Attribute filters and facet counts for the product listings.
+
+`?attr=<attribute_id>:<value>` keeps the products with an active line carrying
+that attribute value. Repeated filters on one attribute are alternatives;
+filters on different attributes must all match the same line, e.g.
+`attr=1:red&attr=1:blue&attr=2:XL` is "a red or blue line in XL".
+
+Both filters and facet counts are answered from ProductLineFacet, an inverted
+index of attribute value to product lines. The index is updated per product
+from catalog_changed, so a request never joins through the attribute tables:
+filters are nested subqueries over one covering index, and the facet counts of
+a listing one aggregate query.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+from django.dispatch import receiver
+from rest_framework.exceptions import ValidationError
+
+from .models import ProductLineAttributeValue, ProductLineFacet
+from .signals import catalog_changed
+
+
+def parse_attr_filters(query_params):
+    """
+    Return the requested filters as a mapping of attribute id to the set of
+    accepted values.
+    """
+    filters = {}
+    for item in query_params.getlist("attr"):
+        attribute, _, value = item.partition(":")
+        if not attribute.isdigit() or not value:
+            raise ValidationError(
+                {"attr": [f"Expected '<attribute_id>:<value>', got '{item}'."]}
+            )
+        filters.setdefault(int(attribute), set()).add(value)
+    return filters
+
+
+def wants_facets(query_params):
+    return query_params.get("facets") in ("true", "1")
+
+
+def matching_products(filters):
+    """
+    Subquery of the ids of products with a line matching every filter.
+    """
+    # Each filter is a range of the covering index; the ranges' lines are
+    # intersected with nested IN subqueries.
+    lines = None
+    for attribute, values in filters.items():
+        facets = ProductLineFacet.objects.filter(attribute=attribute, value__in=values)
+        if lines is not None:
+            facets = facets.filter(product_line__in=lines)
+        lines = facets.values("product_line")
+    return lines.values("product")
+
+
+def filter_products(queryset, filters):
+    if not filters:
+        return queryset
+    return queryset.filter(pk__in=matching_products(filters))
+
+
+def facet_counts(queryset):
+    """
+    Count the products of a listing per attribute value, as
+    `{attribute_id: {value: count}}`.
+    """
+    rows = (
+        ProductLineFacet.objects.filter(product__in=queryset.values("pk"))
+        .values_list("attribute", "value")
+        .annotate(count=Count("product", distinct=True))
+        .order_by("attribute", "value")
+    )
+    facets = {}
+    for attribute, value, count in rows:
+        facets.setdefault(str(attribute), {})[value] = count
+    return facets
+
+
+def index_products(product_ids):
+    """
+    Replace the index rows of the given products with their current active
+    lines' attribute values.
+    """
+    product_ids = set(product_ids)
+    values = ProductLineAttributeValue.objects.filter(
+        product_line__product__in=product_ids, product_line__is_active=True
+    ).values_list(
+        "product_line_id",
+        "product_line__product_id",
+        "attribute_value__attribute_id",
+        "attribute_value__attribute_value",
+    )
+    facets = [
+        ProductLineFacet(
+            product_line_id=line,
+            product_id=product,
+            attribute_id=attribute,
+            value=value,
+        )
+        for line, product, attribute, value in values
+    ]
+    with transaction.atomic():
+        ProductLineFacet.objects.filter(product__in=product_ids).delete()
+        ProductLineFacet.objects.bulk_create(facets)
+
+
+@receiver(catalog_changed)
+def index_changed_products(sender, product_ids, **kwargs):
+    index_products(product_ids)
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import connections, models, router
+from django.db.models import Max, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.core import checks
-from django.core.exceptions import ObjectDoesNotExist
+from django.utils.functional import cached_property
 
 
 class OrderField(models.PositiveIntegerField):
@@ -32,21 +34,72 @@ class OrderField(models.PositiveIntegerField):
             ]
         return []
 
+    @cached_property
+    def db_returning(self):
+        """
+        Whether the INSERT computes the value and reads it back, see
+        next_value_expression(). Decided once per model, from the database its
+        writes are routed to, as Django caches Options.db_returning_fields on
+        first use.
+        """
+        using = router.db_for_write(self.model)
+        return connections[using].features.can_return_columns_from_insert
+
+    def group_filter(self, model_instance):
+        return {self.unique_for_field: getattr(model_instance, self.unique_for_field)}
+
+    def lock_group(self, model_instance):
+        """
+        Lock the row the group hangs off (e.g. the Product of a ProductLine) so
+        concurrent inserts into the same group are serialized until commit.
+        Only effective inside a transaction on backends with SELECT FOR UPDATE;
+        SQLite serializes writers on its own.
+        """
+        related = self.model._meta.get_field(self.unique_for_field)
+        if not related.is_relation:
+            return
+        using = router.db_for_write(self.model, instance=model_instance)
+        db = connections[using]
+        if db.features.has_select_for_update and db.in_atomic_block:
+            pk = getattr(model_instance, related.attname)
+            list(
+                related.related_model._base_manager.using(using)
+                .select_for_update()
+                .filter(pk=pk)
+                .values_list("pk", flat=True)
+            )
+
+    def next_value_expression(self, model_instance):
+        """
+        `(SELECT COALESCE(MAX(order), 0) FROM ... WHERE <group>) + 1`, embedded
+        in the INSERT itself so the read and the write are one statement.
+        """
+        last = (
+            self.model._base_manager.filter(**self.group_filter(model_instance))
+            .order_by()
+            .values(self.unique_for_field)
+            .annotate(last=Max(self.attname))
+            .values("last")
+        )
+        return Coalesce(
+            Subquery(last, output_field=self), Value(0), output_field=self
+        ) + Value(1)
+
     def pre_save(self, model_instance, add):
 
         if getattr(model_instance, self.attname) is None:
-            qs = self.model.objects.all()
-            try:
-                query = {
-                    self.unique_for_field: getattr(
-                        model_instance, self.unique_for_field
-                    )
-                }
-                qs = qs.filter(**query)
-                last_item = qs.latest(self.attname)
-                value = last_item.order + 1
-            except ObjectDoesNotExist:
-                value = 1
+            self.lock_group(model_instance)
+            if add and self.db_returning:
+                # The INSERT ... RETURNING sets the attribute to the real value.
+                # Rows passed to bulk_create() must have their order assigned,
+                # as every row of one statement would see the same MAX().
+                return self.next_value_expression(model_instance)
+
+            last = self.model._base_manager.filter(
+                **self.group_filter(model_instance)
+            ).aggregate(last=Max(self.attname))["last"]
+            value = (last or 0) + 1
+            setattr(model_instance, self.attname, value)
             return value
 
         return super().pre_save(model_instance, add)
@@ -0,0 +1,154 @@
+"""
+Sparse fieldsets for the product endpoints.
+
+`?fields=` lists the fields to return, with dotted paths for nested ones,
+e.g. `fields=name,slug,product_line.price`. `?expand=` lists the relations
+to include on top of the plain fields, e.g. `expand=product_line.specification`.
+Naming a relation in `fields` expands it too. Without either parameter the
+full representation is returned.
+
+The selection is a tree of the same shape as PRODUCT below. It decides both
+what serialize_product_fields() emits and which columns and relations are
+loaded, so asking for less also means fewer queries and narrower rows.
+"""
+
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from .models import Attribute, AttributeValue, ProductImage, ProductLine
+from .pagination import ProductCursorPagination
+
+# Plain fields map to None, relations to the fields they contain.
+PRODUCT_IMAGE = {"url": None, "alternative_text": None, "order": None}
+PRODUCT_LINE = {
+    "price": None,
+    "sku": None,
+    "stock_qty": None,
+    "is_active": None,
+    "product_image": PRODUCT_IMAGE,
+    "specification": {},
+}
+PRODUCT = {
+    "name": None,
+    "slug": None,
+    "description": None,
+    "is_digital": None,
+    "is_active": None,
+    "category_name": None,
+    "product_line": PRODUCT_LINE,
+    "type specification": {},
+}
+
+# Names that are awkward in a query string.
+ALIASES = {"type_specification": "type specification"}
+
+
+def split_paths(value):
+    paths = []
+    for item in value.split(","):
+        item = item.strip()
+        if item:
+            paths.append(tuple(ALIASES.get(name, name) for name in item.split(".")))
+    return paths
+
+
+def check_paths(paths, param, relations_only=False):
+    for path in paths:
+        node = PRODUCT
+        for depth, name in enumerate(path, start=1):
+            if node is None or name not in node:
+                dotted = ".".join(path[:depth])
+                raise ValidationError({param: [f"Unknown field '{dotted}'."]})
+            node = node[name]
+        if relations_only and node is None:
+            dotted = ".".join(path)
+            raise ValidationError({param: [f"'{dotted}' is not a relation."]})
+
+
+def select(schema, fields, expand):
+    """
+    Build the selection tree for one level of `schema`. `fields` is None when
+    every plain field of the level is wanted.
+    """
+    named = None if fields is None else {path[0] for path in fields}
+    selected = {}
+    for name, node in schema.items():
+        if node is None:
+            if named is None or name in named:
+                selected[name] = None
+            continue
+        child_expand = [path[1:] for path in expand if path[0] == name]
+        if (named is None or name not in named) and not child_expand:
+            continue
+        child_fields = [
+            path[1:] for path in fields or () if path[0] == name and len(path) > 1
+        ]
+        selected[name] = select(
+            node, child_fields or None, [path for path in child_expand if path]
+        )
+    return selected
+
+
+def parse_fieldset(query_params):
+    """
+    Return the selection tree requested by `fields` and `expand`, or None for
+    the full representation.
+    """
+    if "fields" not in query_params and "expand" not in query_params:
+        return None
+    fields = split_paths(query_params.get("fields", "")) or None
+    expand = split_paths(query_params.get("expand", ""))
+    check_paths(fields or (), "fields")
+    check_paths(expand, "expand", relations_only=True)
+    return select(PRODUCT, fields, expand)
+
+
+def columns(fields, model_fields):
+    return [name for name in model_fields if name in fields]
+
+
+def apply_fieldset(queryset, fields):
+    """
+    Load only the columns and relations a selection tree needs.
+    """
+    only = list(ProductCursorPagination.cursor_fields)
+    only += columns(fields, ["name", "slug", "description", "is_digital", "is_active"])
+    prefetches = []
+
+    if "category_name" in fields:
+        queryset = queryset.select_related("category")
+        only += ["category", "category__name"]
+    if "type specification" in fields:
+        only.append("product_type")
+        prefetches.append(
+            Prefetch("product_type__attribute", queryset=Attribute.objects.only("name"))
+        )
+    if "product_line" in fields:
+        line = fields["product_line"]
+        line_columns = columns(line, ["price", "sku", "stock_qty", "is_active"])
+        prefetches.append(
+            Prefetch(
+                "product_line",
+                queryset=ProductLine.objects.only("product", *line_columns),
+            )
+        )
+        if "product_image" in line:
+            image_columns = columns(
+                line["product_image"], ["url", "alternative_text", "order"]
+            )
+            prefetches.append(
+                Prefetch(
+                    "product_line__product_image",
+                    queryset=ProductImage.objects.only("product_line", *image_columns),
+                )
+            )
+        if "specification" in line:
+            prefetches.append(
+                Prefetch(
+                    "product_line__attribute_value",
+                    queryset=AttributeValue.objects.only(
+                        "attribute", "attribute_value"
+                    ),
+                )
+            )
+    return queryset.only(*only).prefetch_related(*prefetches)
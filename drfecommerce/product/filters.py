@@ -0,0 +1,76 @@
+"""
+Price and stock filters for the product listings.
+
+`?price_min=` and `?price_max=` keep the products with an active line priced
+within the bounds, and `?in_stock=true` the products with stock on an active
+line; combined, they keep the products with a single line meeting them all.
+`?ordering=price` (or `-price`) sorts by the lowest line price, leaving out
+products with no active line to price.
+
+They all read the summary columns on Product (see summaries.py), so a filtered
+listing is a range scan of a partial index rather than a GROUP BY over the
+product lines. The summary settles a single condition on its own; for two or
+more it is only a prefilter, and the products it keeps are checked for a
+matching line against product_line_summary_idx.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+
+from .models import ProductLine
+from .pagination import ProductCursorPagination
+
+
+def parse_price(query_params, param):
+    value = query_params.get(param)
+    if value is None:
+        return None
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        price = None
+    if price is None or not price.is_finite():
+        raise ValidationError({param: ["A valid number is required."]})
+    return price
+
+
+def parse_listing_filters(query_params):
+    ordering = query_params.get(ProductCursorPagination.ordering_query_param)
+    if ordering is not None and ordering not in ProductCursorPagination.orderings:
+        choices = ", ".join(ProductCursorPagination.orderings)
+        raise ValidationError({"ordering": [f"Expected one of: {choices}."]})
+    return {
+        "price_min": parse_price(query_params, "price_min"),
+        "price_max": parse_price(query_params, "price_max"),
+        "in_stock": query_params.get("in_stock") in ("true", "1"),
+        "by_price": ordering is not None,
+    }
+
+
+def filter_listing(queryset, filters):
+    lines = {}
+    if filters["price_min"] is not None:
+        queryset = queryset.filter(max_price__gte=filters["price_min"])
+        lines["price__gte"] = filters["price_min"]
+    if filters["price_max"] is not None:
+        queryset = queryset.filter(min_price__lte=filters["price_max"])
+        lines["price__lte"] = filters["price_max"]
+    if filters["in_stock"]:
+        queryset = queryset.filter(stock_qty__gt=0)
+        lines["stock_qty__gt"] = 0
+    if len(lines) > 1:
+        # The summary columns judge each condition over all the lines, so a
+        # product can pass them all without one line meeting every condition.
+        queryset = queryset.filter(
+            Exists(
+                ProductLine.objects.filter(
+                    product=OuterRef("pk"), is_active=True, **lines
+                )
+            )
+        )
+    if filters["by_price"]:
+        # Keyset pagination needs a non-null ordering.
+        queryset = queryset.filter(min_price__isnull=False)
+    return queryset
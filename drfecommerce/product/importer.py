@@ -0,0 +1,396 @@
+"""
+Bulk catalog import.
+
+Rows describe one product line (SKU) each, together with the product it
+belongs to. They are processed in chunks: every lookup a chunk needs is done
+with one set-based query, rows are validated in Python against those results,
+and the chunk is written with bulk_create() inside a single transaction.
+"""
+
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxLengthValidator
+from django.db import DatabaseError, models, transaction
+from django.db.models import Max
+
+from .models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductImage,
+    ProductLine,
+    ProductLineAttributeValue,
+    ProductType,
+)
+from .signals import notify
+
+PRODUCT_FIELDS = ["name", "slug", "description"]
+LINE_FIELDS = ["sku", "price", "stock_qty", "weight"]
+IMAGE_FIELDS = ["url", "alternative_text"]
+# Fields looked up by value for the whole chunk.
+LOOKUP_FIELDS = ["pid", "slug", "sku", "category", "product_type"]
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+
+
+@dataclass
+class RowError:
+    row: int
+    message: str
+
+
+@dataclass
+class ChunkReport:
+    index: int
+    rows: int
+    products_created: int = 0
+    lines_created: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_jsonl(stream):
+    """
+    Yield one dict per non-empty line. `attributes` is an object of attribute
+    name to value and `images` a list of urls or {url, alternative_text}.
+    """
+    for line in stream:
+        line = line.strip()
+        if line:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield {"_error": f"invalid JSON: {exc.msg}"}
+                continue
+            if isinstance(row, dict):
+                yield row
+            else:
+                yield {"_error": "expected a JSON object"}
+
+
+def read_csv(stream):
+    """
+    Yield one dict per CSV row. `attributes` is written as `color=red;size=M`
+    and `images` as `front.jpg|back.jpg`.
+    """
+    for row in csv.DictReader(stream):
+        attributes = row.get("attributes") or ""
+        row["attributes"] = dict(
+            pair.split("=", 1) for pair in attributes.split(";") if "=" in pair
+        )
+        images = row.get("images") or ""
+        row["images"] = [url for url in images.split("|") if url]
+        yield row
+
+
+def as_bool(value, default=False):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def clean_fields(model, names, row):
+    """
+    Run each model field's to_python() and validators over the raw values.
+    """
+    values = {}
+    for name in names:
+        model_field = model._meta.get_field(name)
+        values[name] = model_field.clean(row.get(name), None)
+        if isinstance(model_field, models.FileField):
+            # Only forms check a file name's length; the database may not.
+            MaxLengthValidator(model_field.max_length)(str(values[name]))
+    return values
+
+
+def lookup_values(chunk, name):
+    """
+    The values of `name` in the chunk's rows that can be looked up; rows with
+    an object or list there are rejected by validate_row().
+    """
+    return {
+        row.get(name) for row in chunk if not isinstance(row.get(name), (dict, list))
+    }
+
+
+class CatalogImporter:
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+
+    def run(self, rows):
+        """
+        Import an iterable of row dicts, yielding a ChunkReport per chunk.
+        """
+        rows = iter(rows)
+        start_row = 1
+        index = 0
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            index += 1
+            started = time.perf_counter()
+            report = ChunkReport(index=index, rows=len(chunk))
+            self.import_chunk(chunk, start_row, report)
+            report.seconds = time.perf_counter() - started
+            start_row += len(chunk)
+            yield report
+
+    def import_chunk(self, chunk, start_row, report):
+        valid = self.validate_chunk(chunk, start_row, report)
+        if not valid:
+            return
+        try:
+            with transaction.atomic():
+                product_ids = self.write_chunk(valid, report)
+        except DatabaseError as exc:
+            report.products_created = report.lines_created = 0
+            report.errors.append(RowError(start_row, f"chunk rolled back: {exc}"))
+            return
+        # bulk_create() bypasses the model signals, so refresh documents and
+        # caches once for the whole chunk.
+        notify(product_ids)
+
+    def validate_chunk(self, chunk, start_row, report):
+        categories = dict(
+            Category.objects.filter(
+                slug__in=lookup_values(chunk, "category")
+            ).values_list("slug", "pk")
+        )
+        product_types = dict(
+            ProductType.objects.filter(
+                name__in=lookup_values(chunk, "product_type")
+            ).values_list("name", "pk")
+        )
+        products = set(
+            Product.objects.filter(pid__in=lookup_values(chunk, "pid")).values_list(
+                "pid", flat=True
+            )
+        )
+        taken_slugs = set(
+            Product.objects.filter(slug__in=lookup_values(chunk, "slug")).values_list(
+                "slug", flat=True
+            )
+        )
+        taken_skus = set(
+            ProductLine.objects.filter(sku__in=lookup_values(chunk, "sku")).values_list(
+                "sku", flat=True
+            )
+        )
+        attributes = dict(
+            Attribute.objects.filter(
+                name__in={
+                    name
+                    for row in chunk
+                    if isinstance(row.get("attributes"), dict)
+                    for name in row["attributes"]
+                }
+            ).values_list("name", "pk")
+        )
+
+        valid = []
+        new_products = {}
+        for offset, row in enumerate(chunk):
+            number = start_row + offset
+            try:
+                valid.append(
+                    self.validate_row(
+                        row,
+                        categories,
+                        product_types,
+                        products,
+                        new_products,
+                        taken_slugs,
+                        taken_skus,
+                        attributes,
+                    )
+                )
+            except ValidationError as exc:
+                report.errors.append(RowError(number, "; ".join(exc.messages)))
+        return valid
+
+    def validate_row(
+        self,
+        row,
+        categories,
+        product_types,
+        products,
+        new_products,
+        taken_slugs,
+        taken_skus,
+        attributes,
+    ):
+        if "_error" in row:
+            raise ValidationError(row["_error"])
+        for name in LOOKUP_FIELDS:
+            if isinstance(row.get(name), (dict, list)):
+                raise ValidationError(f"{name} must be a single value")
+
+        line = clean_fields(ProductLine, LINE_FIELDS, row)
+        line["is_active"] = as_bool(row.get("is_active"), default=True)
+        if line["sku"] in taken_skus:
+            raise ValidationError(f"duplicate sku {line['sku']!r}")
+
+        product_type = product_types.get(row.get("product_type"))
+        if product_type is None:
+            raise ValidationError(f"unknown product type {row.get('product_type')!r}")
+
+        row_attributes = row.get("attributes") or {}
+        if not isinstance(row_attributes, dict):
+            raise ValidationError("attributes must be an object of name to value")
+        values = {}
+        for name, value in row_attributes.items():
+            if name not in attributes:
+                raise ValidationError(f"unknown attribute {name!r}")
+            value = clean_fields(
+                AttributeValue, ["attribute_value"], {"attribute_value": str(value)}
+            )
+            values[attributes[name]] = value["attribute_value"]
+
+        row_images = row.get("images") or []
+        if not isinstance(row_images, list):
+            raise ValidationError("images must be a list")
+        images = []
+        for image in row_images:
+            if isinstance(image, str):
+                image = {"url": image}
+            if not isinstance(image, dict):
+                raise ValidationError("each image must be a url or an object")
+            image = {
+                "url": image.get("url"),
+                "alternative_text": image.get("alternative_text") or line["sku"],
+            }
+            images.append(clean_fields(ProductImage, IMAGE_FIELDS, image))
+
+        pid = Product._meta.get_field("pid").clean(row.get("pid"), None)
+        if pid not in products and pid not in new_products:
+            product = clean_fields(Product, PRODUCT_FIELDS, row)
+            product["category_id"] = categories.get(row.get("category"))
+            if product["category_id"] is None:
+                raise ValidationError(f"unknown category {row.get('category')!r}")
+            if product["slug"] in taken_slugs:
+                raise ValidationError(f"duplicate product slug {product['slug']!r}")
+            product["is_digital"] = as_bool(row.get("is_digital"))
+            product["is_active"] = as_bool(row.get("product_is_active"), default=True)
+            product["product_type_id"] = product_type
+            new_products[pid] = product
+            taken_slugs.add(product["slug"])
+
+        taken_skus.add(line["sku"])
+        return {
+            "pid": pid,
+            "product": new_products.get(pid),
+            "product_type_id": product_type,
+            "line": line,
+            "attribute_values": values,
+            "images": images,
+        }
+
+    def write_chunk(self, rows, report):
+        # Products, keyed by pid; only the first row of a new product carries
+        # its fields.
+        created = {}
+        for row in rows:
+            if row["product"] is not None and row["pid"] not in created:
+                created[row["pid"]] = Product(pid=row["pid"], **row["product"])
+        Product.objects.bulk_create(created.values())
+        report.products_created = len(created)
+        product_ids = dict(
+            Product.objects.filter(pid__in={row["pid"] for row in rows}).values_list(
+                "pid", "pk"
+            )
+        )
+
+        # Line orders continue from each product's current maximum.
+        next_order = dict(
+            ProductLine.objects.filter(product_id__in=product_ids.values())
+            .values("product_id")
+            .annotate(last=Max("order"))
+            .values_list("product_id", "last")
+        )
+        lines = []
+        for row in rows:
+            product_id = product_ids[row["pid"]]
+            order = (next_order.get(product_id) or 0) + 1
+            next_order[product_id] = order
+            lines.append(
+                ProductLine(
+                    product_id=product_id,
+                    product_type_id=row["product_type_id"],
+                    order=order,
+                    **row["line"],
+                )
+            )
+        ProductLine.objects.bulk_create(lines)
+        report.lines_created = len(lines)
+        line_ids = dict(
+            ProductLine.objects.filter(
+                sku__in=[line.sku for line in lines]
+            ).values_list("sku", "pk")
+        )
+
+        value_ids = self.attribute_value_ids(rows)
+        ProductLineAttributeValue.objects.bulk_create(
+            ProductLineAttributeValue(
+                product_line_id=line_ids[row["line"]["sku"]],
+                attribute_value_id=value_ids[(attribute_id, value)],
+            )
+            for row in rows
+            for attribute_id, value in row["attribute_values"].items()
+        )
+
+        ProductImage.objects.bulk_create(
+            ProductImage(
+                product_line_id=line_ids[row["line"]["sku"]],
+                order=order,
+                **image,
+            )
+            for row in rows
+            for order, image in enumerate(row["images"], start=1)
+        )
+        return set(product_ids.values())
+
+    def attribute_value_ids(self, rows):
+        """
+        Map (attribute id, value) to an AttributeValue id, creating the values
+        that do not exist yet.
+        """
+        wanted = {
+            (attribute_id, value)
+            for row in rows
+            for attribute_id, value in row["attribute_values"].items()
+        }
+        if not wanted:
+            return {}
+
+        def existing():
+            rows = AttributeValue.objects.filter(
+                attribute_id__in={attribute_id for attribute_id, _ in wanted},
+                attribute_value__in={value for _, value in wanted},
+            ).values_list("pk", "attribute_id", "attribute_value")
+            return {
+                (attribute_id, value): pk
+                for pk, attribute_id, value in rows
+                if (attribute_id, value) in wanted
+            }
+
+        found = existing()
+        missing = wanted - found.keys()
+        if missing:
+            AttributeValue.objects.bulk_create(
+                AttributeValue(attribute_id=attribute_id, attribute_value=value)
+                for attribute_id, value in missing
+            )
+            found = existing()
+        return found
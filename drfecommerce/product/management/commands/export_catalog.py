@@ -0,0 +1,39 @@
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...export import CHUNK_SIZE, export_queryset, ndjson_chunks
+
+
+class Command(BaseCommand):
+    help = "Export every active product as JSON Lines, one document per line"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", nargs="?", help="Output file, standard output by default"
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        if path is None:
+            self.export(partial(self.stdout.write, ending=""), options["chunk_size"])
+            return
+
+        try:
+            stream = open(path, "w", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(exc)
+        with stream:
+            count = self.export(stream.write, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"exported {count} products"))
+
+    def export(self, write, chunk_size):
+        count = 0
+        for chunk in ndjson_chunks(export_queryset(), chunk_size):
+            write(chunk)
+            count += chunk.count("\n")
+        return count
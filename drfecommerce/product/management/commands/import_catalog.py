@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...importer import CatalogImporter, read_csv, read_jsonl
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+
+class Command(BaseCommand):
+    help = "Bulk import products, lines, attribute values and images"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON Lines file, one SKU per row")
+        parser.add_argument(
+            "--format",
+            choices=READERS,
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        importer = CatalogImporter(chunk_size=options["chunk_size"])
+        totals = {"rows": 0, "lines": 0, "errors": 0, "seconds": 0.0}
+        try:
+            stream = open(path, newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(exc)
+
+        with stream:
+            for report in importer.run(READERS[fmt](stream)):
+                self.stdout.write(
+                    f"chunk {report.index}: {report.rows} rows, "
+                    f"{report.products_created} products, "
+                    f"{report.lines_created} lines, {len(report.errors)} errors, "
+                    f"{report.rows_per_second:.0f} rows/s"
+                )
+                for error in report.errors:
+                    self.stderr.write(f"  row {error.row}: {error.message}")
+                totals["rows"] += report.rows
+                totals["lines"] += report.lines_created
+                totals["errors"] += len(report.errors)
+                totals["seconds"] += report.seconds
+
+        rate = totals["rows"] / totals["seconds"] if totals["seconds"] else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"imported {totals['lines']} of {totals['rows']} rows "
+                f"with {totals['errors']} errors at {rate:.0f} rows/s"
+            )
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0004_category_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["tree_id", "lft", "rght"], name="category_tree_range_idx"
+            ),
+        ),
+    ]
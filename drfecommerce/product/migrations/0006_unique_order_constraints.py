@@ -0,0 +1,61 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:34
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def renumber_duplicate_orders(apps, schema_editor):
+    # Concurrent inserts could give two rows of a parent the same order. Keep
+    # the first row of each order by id and move the rest past the parent's
+    # highest order, in id order, so that the constraints below can be added.
+    for model_name, parent in [
+        ("ProductLine", "product"),
+        ("ProductImage", "product_line"),
+    ]:
+        model = apps.get_model("product", model_name)
+        parents = (
+            model.objects.values(parent, "order")
+            .annotate(rows=Count("pk"))
+            .filter(rows__gt=1)
+            .values_list(parent, flat=True)
+            .distinct()
+        )
+        for parent_id in list(parents):
+            rows = model.objects.filter(**{parent: parent_id}).order_by("pk")
+            next_order = rows.aggregate(last=Max("order"))["last"] + 1
+            seen = set()
+            moved = []
+            for row in rows:
+                if row.order in seen:
+                    row.order = next_order
+                    next_order += 1
+                    moved.append(row)
+                seen.add(row.order)
+            model.objects.bulk_update(moved, ["order"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0005_category_tree_range_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_orders, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="productimage",
+            constraint=models.UniqueConstraint(
+                fields=("product_line", "order"),
+                name="product_image_unique_order",
+                violation_error_message="Duplicate value",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productline",
+            constraint=models.UniqueConstraint(
+                fields=("product", "order"),
+                name="product_line_unique_order",
+                violation_error_message="Duplicate value",
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_facets(apps, schema_editor):
+    ProductLineAttributeValue = apps.get_model("product", "ProductLineAttributeValue")
+    ProductLineFacet = apps.get_model("product", "ProductLineFacet")
+    rows = ProductLineAttributeValue.objects.filter(
+        product_line__is_active=True
+    ).values_list(
+        "product_line_id",
+        "product_line__product_id",
+        "attribute_value__attribute_id",
+        "attribute_value__attribute_value",
+    )
+    ProductLineFacet.objects.bulk_create(
+        (
+            ProductLineFacet(
+                product_line_id=line,
+                product_id=product,
+                attribute_id=attribute,
+                value=value,
+            )
+            for line, product, attribute, value in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0007_catalog_read_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductLineFacet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.CharField(max_length=100)),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.product",
+                    ),
+                ),
+                (
+                    "product_line",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet",
+                        to="product.productline",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["attribute", "value", "product_line", "product"],
+                        name="facet_attribute_value_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productlinefacet",
+            constraint=models.UniqueConstraint(
+                fields=("product_line", "attribute"), name="facet_unique_line_attribute"
+            ),
+        ),
+        migrations.RunPython(build_facets, migrations.RunPython.noop),
+    ]
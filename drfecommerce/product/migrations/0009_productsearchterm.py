@@ -0,0 +1,91 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:12
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of the tokenizer and weights in product/search.py as of this
+# migration, so that later changes there do not change what it backfills.
+FIELD_WEIGHTS = {"name": 3.0, "category__name": 2.0, "description": 1.0}
+MAX_TERM_LENGTH = 50
+WORD = re.compile(r"\w+")
+
+
+def terms(text):
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [word[:MAX_TERM_LENGTH] for word in WORD.findall(text)]
+
+
+def term_weights(fields):
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term, count in Counter(terms(fields[field] or "")).items():
+            weights[term] += weight * (1 + math.log(count))
+    return weights
+
+
+def build_search_index(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    ProductSearchTerm = apps.get_model("product", "ProductSearchTerm")
+    products = Product.objects.filter(is_active=True).values("pk", *FIELD_WEIGHTS)
+    ProductSearchTerm.objects.bulk_create(
+        (
+            ProductSearchTerm(product_id=product["pk"], term=term, weight=weight)
+            for product in products.iterator()
+            for term, weight in term_weights(product).items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0008_productlinefacet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=50)),
+                ("weight", models.FloatField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.product",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["term", "product", "weight"], name="search_term_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productsearchterm",
+            constraint=models.UniqueConstraint(
+                fields=("product", "term"), name="search_term_unique_product"
+            ),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
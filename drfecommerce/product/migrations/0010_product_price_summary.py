@@ -0,0 +1,81 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:29
+
+from django.db import migrations, models
+from django.db.models import Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+# Frozen copy of summary_columns() in product/summaries.py as of this
+# migration, so that later changes there do not change what it backfills.
+def summary_columns(product_model, line_model):
+    lines = line_model.objects.filter(product=OuterRef("pk"), is_active=True).values(
+        "product"
+    )
+
+    def aggregate(function):
+        return Subquery(lines.annotate(value=function).values("value"))
+
+    return {
+        "min_price": aggregate(Min("price")),
+        "max_price": aggregate(Max("price")),
+        "stock_qty": Coalesce(aggregate(Sum("stock_qty")), Value(0)),
+    }
+
+
+def summarize_products(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    ProductLine = apps.get_model("product", "ProductLine")
+    Product.objects.update(**summary_columns(Product, ProductLine))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0009_productsearchterm"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="max_price",
+            field=models.DecimalField(
+                decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="min_price",
+            field=models.DecimalField(
+                decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="stock_qty",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["min_price", "id"],
+                name="product_active_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("stock_qty__gt", 0)),
+                fields=["min_price", "id"],
+                name="product_in_stock_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productline",
+            index=models.Index(
+                fields=["product", "is_active", "price", "stock_qty"],
+                name="product_line_summary_idx",
+            ),
+        ),
+        migrations.RunPython(summarize_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 21:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0010_product_price_summary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["updated_at"], name="category_updated_idx"),
+        ),
+    ]
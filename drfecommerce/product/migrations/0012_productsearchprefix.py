@@ -0,0 +1,81 @@
+# Generated by Django 5.0.4 on 2026-10-18 21:35
+
+from collections import Counter
+from itertools import groupby
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of search.PREFIX_LENGTH as of this migration.
+PREFIX_LENGTH = 5
+
+
+def build_prefix_index(apps, schema_editor):
+    ProductSearchTerm = apps.get_model("product", "ProductSearchTerm")
+    ProductSearchPrefix = apps.get_model("product", "ProductSearchPrefix")
+    rows = (
+        ProductSearchTerm.objects.order_by("product")
+        .values_list("product", "term", "weight")
+        .iterator()
+    )
+
+    def prefix_rows():
+        for product_id, terms in groupby(rows, key=lambda row: row[0]):
+            weights = Counter()
+            for _, term, weight in terms:
+                for length in range(1, min(len(term), PREFIX_LENGTH) + 1):
+                    weights[term[:length]] += weight
+            for prefix, weight in weights.items():
+                yield ProductSearchPrefix(
+                    product_id=product_id, prefix=prefix, weight=weight
+                )
+
+    ProductSearchPrefix.objects.bulk_create(prefix_rows(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0011_category_updated_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSearchPrefix",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("prefix", models.CharField(max_length=5)),
+                ("weight", models.FloatField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.product",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["prefix", "weight", "product"], name="search_prefix_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productsearchprefix",
+            constraint=models.UniqueConstraint(
+                fields=("product", "prefix"), name="search_prefix_unique_product"
+            ),
+        ),
+        migrations.RunPython(build_prefix_index, migrations.RunPython.noop),
+    ]
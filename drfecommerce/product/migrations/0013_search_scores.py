@@ -0,0 +1,54 @@
+# Generated by Django 5.0.4 on 2026-10-18 22:09
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Frozen copy of search.PREFIX_WEIGHT as of this migration.
+PREFIX_WEIGHT = 0.5
+
+
+def score_prefixes(apps, schema_editor):
+    # The renamed column holds the summed weight of the terms starting with
+    # the prefix; add the rest of the weight of the term equal to it.
+    ProductSearchTerm = apps.get_model("product", "ProductSearchTerm")
+    ProductSearchPrefix = apps.get_model("product", "ProductSearchPrefix")
+    exact = ProductSearchTerm.objects.filter(
+        product=OuterRef("product"), term=OuterRef("prefix")
+    ).values("weight")
+    ProductSearchPrefix.objects.update(
+        score=F("score") * PREFIX_WEIGHT
+        + Coalesce(Subquery(exact), Value(0.0)) * (1 - PREFIX_WEIGHT)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0012_productsearchprefix"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="productsearchprefix",
+            name="search_prefix_idx",
+        ),
+        migrations.RenameField(
+            model_name="productsearchprefix",
+            old_name="weight",
+            new_name="score",
+        ),
+        migrations.RunPython(score_prefixes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="productsearchterm",
+            index=models.Index(
+                fields=["term", "weight", "product"], name="search_term_weight_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productsearchprefix",
+            index=models.Index(
+                fields=["prefix", "score", "product"], name="search_prefix_score_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.forms import ValidationError
 from mptt.models import MPTTModel, TreeForeignKey
 from .fields import OrderField
@@ -9,16 +9,54 @@ class IsActiveQuerySet(models.QuerySet):
         return self.filter(is_active=True)
 
 
+class ProductQuerySet(IsActiveQuerySet):
+    def in_category_tree(self, category):
+        """
+        Products in `category` or any of its descendants, as one range
+        predicate on the nested set columns instead of a list of ids.
+        """
+        return self.filter(
+            category__tree_id=category.tree_id,
+            category__lft__gte=category.lft,
+            category__lft__lte=category.rght,
+        )
+
+    def for_api(self):
+        """
+        Load everything ProductSerializer walks in a fixed number of queries.
+        """
+        return self.select_related("category").prefetch_related(
+            "product_line__product_image",
+            "product_line__attribute_value__attribute",
+            "product_type__attribute",
+        )
+
+
 class Category(MPTTModel):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=255, unique=True)
     is_active = models.BooleanField(default=False)
     parent = TreeForeignKey("self", on_delete=models.PROTECT, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     objects = IsActiveQuerySet.as_manager()
 
     class MPTTMeta:
         order_insertion_by = ["name"]
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["tree_id", "lft", "rght"], name="category_tree_range_idx"
+            ),
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(is_active=True),
+                name="category_active_updated_idx",
+            ),
+            # The category tree version covers inactive categories too.
+            models.Index(fields=["updated_at"], name="category_updated_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
@@ -35,6 +73,15 @@ class Product(models.Model):
         "ProductType", on_delete=models.PROTECT, related_name="product"
     )
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    # Summary of the active product lines, kept current by summaries.py so that
+    # listings filter and sort on indexed columns instead of a GROUP BY.
+    min_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, editable=False
+    )
+    max_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, editable=False
+    )
+    stock_qty = models.IntegerField(default=0, editable=False)
 
     attribute_value = models.ManyToManyField(
         "AttributeValue",
@@ -42,12 +89,54 @@ class Product(models.Model):
         related_name="product_attribute_value",
     )
 
-    objects = IsActiveQuerySet.as_manager()
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="product_created_at_id_idx"),
+            # Listings only ever read active products.
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(is_active=True),
+                name="product_active_created_idx",
+            ),
+            models.Index(
+                fields=["category", "created_at", "id"],
+                condition=models.Q(is_active=True),
+                name="product_active_category_idx",
+            ),
+            # Price ranges and price ordering, with and without ?in_stock.
+            models.Index(
+                fields=["min_price", "id"],
+                condition=models.Q(is_active=True),
+                name="product_active_price_idx",
+            ),
+            models.Index(
+                fields=["min_price", "id"],
+                condition=models.Q(is_active=True, stock_qty__gt=0),
+                name="product_in_stock_price_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
+class ProductDocument(models.Model):
+    """
+    Precomputed ProductSerializer output for a product, stored as rendered JSON.
+    """
+
+    product = models.OneToOneField(
+        Product, on_delete=models.CASCADE, primary_key=True, related_name="document"
+    )
+    document = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.product_id}_document"
+
+
 class Attribute(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField()
@@ -89,20 +178,153 @@ class ProductLine(models.Model):
 
     objects = IsActiveQuerySet.as_manager()
 
+    class Meta:
+        constraints = [
+            # full_clean() checks this with one indexed exists() query.
+            models.UniqueConstraint(
+                fields=["product", "order"],
+                name="product_line_unique_order",
+                violation_error_message="Duplicate value",
+            ),
+        ]
+        indexes = [
+            # Covers the price and stock summary of a product's active lines.
+            models.Index(
+                fields=["product", "is_active", "price", "stock_qty"],
+                name="product_line_summary_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super(ProductLine, self).save(*args, **kwargs)
-
-    def clean(self):
-        qs = ProductLine.objects.filter(product=self.product_id)
-        for obj in qs:
-            if obj.id != self.id and obj.order == self.order:
-                raise ValidationError("Duplicate value")
+        with transaction.atomic():
+            return super(ProductLine, self).save(*args, **kwargs)
+
+    def validate_attribute_values(self, values):
+        """
+        Check that attaching `values` keeps one value per attribute on this
+        line, for the whole batch in a single query.
+        """
+        attribute_ids = [value.attribute_id for value in values]
+        if len(set(attribute_ids)) != len(attribute_ids):
+            raise ValidationError("Duplicate attribute value")
+
+        conflicts = (
+            ProductLineAttributeValue.objects.filter(
+                product_line=self, attribute_value__attribute_id__in=attribute_ids
+            )
+            .exclude(attribute_value__in=values)
+            .exists()
+        )
+        if conflicts:
+            raise ValidationError("Duplicate attribute value")
+
+    def add_attribute_values(self, values):
+        """
+        Attach a batch of AttributeValues, validated together.
+        """
+        values = list(values)
+        self.validate_attribute_values(values)
+        self.attribute_value.add(*values)
 
     def __str__(self) -> str:
         return f"product_line_{self.sku}"
 
 
+class ProductLineFacet(models.Model):
+    """
+    Inverted index of attribute values: one row per attribute value of an
+    active product line, so attribute filters and facet counts read a single
+    table. Maintained by facets.py from catalog_changed.
+    """
+
+    attribute = models.ForeignKey(Attribute, on_delete=models.CASCADE, related_name="+")
+    value = models.CharField(max_length=100)
+    product_line = models.ForeignKey(
+        ProductLine, on_delete=models.CASCADE, related_name="facet"
+    )
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product_line", "attribute"],
+                name="facet_unique_line_attribute",
+            ),
+        ]
+        indexes = [
+            # Covers filters (the lines and products holding a value) and facet
+            # counts (the products per value, in value order).
+            models.Index(
+                fields=["attribute", "value", "product_line", "product"],
+                name="facet_attribute_value_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product_line_id}_{self.attribute_id}:{self.value}"
+
+
+class ProductSearchTerm(models.Model):
+    """
+    Inverted index for product search: one row per distinct term of an active
+    product's name, description and category name. Maintained by search.py
+    from catalog_changed.
+    """
+
+    term = models.CharField(max_length=50)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "term"], name="search_term_unique_product"
+            ),
+        ]
+        indexes = [
+            # Covers the term range scans of a query.
+            models.Index(fields=["term", "product", "weight"], name="search_term_idx"),
+            # Reads a term's best products in weight order.
+            models.Index(
+                fields=["term", "weight", "product"], name="search_term_weight_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product_id}_{self.term}"
+
+
+class ProductSearchPrefix(models.Model):
+    """
+    Product search scores by leading characters of the terms: one row per
+    product and distinct 1 to 5 character prefix of its terms, holding the
+    score a query of that prefix gives the product, so a short single word is
+    ranked from an index range instead of an aggregate over every matching
+    term. Maintained by search.py with ProductSearchTerm.
+    """
+
+    prefix = models.CharField(max_length=5)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "prefix"], name="search_prefix_unique_product"
+            ),
+        ]
+        indexes = [
+            # Reads a prefix's best products in score order.
+            models.Index(
+                fields=["prefix", "score", "product"], name="search_prefix_score_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product_id}_{self.prefix}"
+
+
 class ProductLineAttributeValue(models.Model):
     product_line = models.ForeignKey(
         ProductLine,
@@ -119,19 +341,7 @@ class ProductLineAttributeValue(models.Model):
         unique_together = ("product_line", "attribute_value")
 
     def clean(self):
-        print(self.product_line)
-        print(self.attribute_value)
-        qs = ProductLineAttributeValue.objects.filter(
-            attribute_value=self.attribute_value
-        ).filter(product_line=self.product_line)
-
-        if not qs:
-            iqs = Attribute.objects.filter(
-                attribute_value__product_line_attribute_value=self.product_line
-            ).values_list("pk", flat=True)
-
-            if self.attribute_value.attribute.id in list(iqs):
-                raise ValidationError("Duplicate attribute value")
+        self.product_line.validate_attribute_values([self.attribute_value])
 
     def save(self, *args, **kwargs):
         self.full_clean()
@@ -162,15 +372,19 @@ class ProductImage(models.Model):
     )
     order = OrderField(unique_for_field="product_line", blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product_line", "order"],
+                name="product_image_unique_order",
+                violation_error_message="Duplicate value",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super(ProductImage, self).save(*args, **kwargs)
-
-    def clean(self):
-        qs = ProductImage.objects.filter(product_line=self.product_line)
-        for obj in qs:
-            if obj.id != self.id and obj.order == self.order:
-                raise ValidationError("Duplicate value")
+        with transaction.atomic():
+            return super(ProductImage, self).save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.product_line.sku}_img"
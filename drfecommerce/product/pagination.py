@@ -0,0 +1,228 @@
+import binascii
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a unique, non-nullable ordering.
+
+    Each page is fetched with a `WHERE (a, b) > (x, y)` style predicate built
+    from the last row of the previous page, so the cost of a page does not
+    depend on how deep the client has paged. Cursors are opaque base64 tokens.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    page_size_query_description = _("Number of results to return per page.")
+    max_page_size = 100
+    invalid_cursor_message = _("Invalid cursor")
+
+    # The last field must be unique so that every row has a distinct position.
+    ordering = ("-id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset])
+
+    def page_queryset(self, queryset, request, view=None):
+        """
+        Return the unevaluated query for the requested page plus one row.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip("-")) for name in self.ordering
+        ]
+
+        self.position, self.reverse = self.decode_cursor(request)
+        ordering = self._invert(self.ordering) if self.reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self._seek(ordering, self.position))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param in request.query_params:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+            except ValueError:
+                return self.page_size
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            values = payload["p"]
+            reverse = bool(payload.get("r", False))
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                field.to_python(value) for field, value in zip(self.fields, values)
+            ]
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            UnicodeError,
+            binascii.Error,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        values = [field.value_to_string(instance) for field in self.fields]
+        payload = {"p": values}
+        if reverse:
+            payload["r"] = 1
+        encoded = b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.page_size_query_description),
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(
+            name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+        )
+
+    @staticmethod
+    def _seek(ordering, position):
+        """
+        Expand a row comparison into `(a > x) OR (a = x AND b > y) ...` so that
+        it can be answered from a composite index on every backend.
+        """
+        seek = Q()
+        for index, name in enumerate(ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            clause = Q(**{f"{name.lstrip('-')}__{lookup}": position[index]})
+            for prev_name, prev_value in zip(ordering[:index], position[:index]):
+                clause &= Q(**{prev_name.lstrip("-"): prev_value})
+            seek |= clause
+        return seek
+
+
+class ProductCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+    ordering_query_param = "ordering"
+    # Price orderings need a priced product, see filters.py.
+    orderings = {"price": ("min_price", "id"), "-price": ("-min_price", "-id")}
+    # Columns cursors are built from, for querysets narrowed with only().
+    cursor_fields = ("pk", "created_at", "min_price")
+
+    def get_ordering(self, request, queryset, view):
+        name = request.query_params.get(self.ordering_query_param)
+        return self.orderings.get(name, self.ordering)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.ordering_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Sort by product price instead of newest first.",
+                "schema": {"type": "string", "enum": list(self.orderings)},
+            },
+        ]
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        # Sent with ?facets=true: attribute id -> value -> product count.
+        response["properties"]["facets"] = {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "additionalProperties": {"type": "integer"},
+            },
+        }
+        return response
@@ -0,0 +1,59 @@
+"""
+JSON rendering for catalog responses.
+
+CatalogJSONRenderer encodes with orjson when it is installed and enabled with
+the FAST_JSON_RENDERER setting. orjson handles str, numbers, dicts, lists,
+datetimes and UUIDs natively and hands anything else (Decimal, lazy strings,
+querysets...) to DRF's JSONEncoder.default(), so the output matches
+JSONRenderer's compact output. Requests for indented output, and settings
+that change JSONRenderer's encoding, fall back to JSONRenderer.
+"""
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# orjson writes these characters raw; JSONRenderer escapes them so that the
+# output is also valid JavaScript.
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+def fast_json_enabled():
+    return orjson is not None and settings.FAST_JSON_RENDERER
+
+
+def dumps(data):
+    """
+    Encode `data` like JSONRenderer's compact output, with orjson.
+    """
+    content = orjson.dumps(
+        data,
+        default=JSONEncoder().default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+    )
+    for raw, escaped in LINE_SEPARATORS:
+        if raw in content:
+            content = content.replace(raw, escaped)
+    return content
+
+
+class CatalogJSONRenderer(JSONRenderer):
+    def use_fast_path(self, accepted_media_type, renderer_context):
+        return (
+            fast_json_enabled()
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_fast_path(
+            accepted_media_type, renderer_context
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,270 @@
+"""
+Full-text product search.
+
+Active products are indexed in ProductSearchTerm, one row per distinct word of
+their name, description and category name, weighted by where and how often
+the word occurs. The index is updated from catalog_changed, for the products
+whose indexed text changed.
+
+A query matches the products that have all of its words, the last one as a
+prefix, so results follow a partly typed word. The prefix is looked up as a
+range of the term index (`term >= 'shi' AND term < 'shj'`), which any backend
+answers from the index, unlike LIKE. The products holding every word are found
+first by intersecting the words' index entries, and only their rows are scored:
+by the summed weights of the matching terms, a term that only extends the last
+word counting for less than an exact one. Since every result holds every query
+word, the rarity of the words would not change the order much and is not
+weighed in.
+
+A single word of up to PREFIX_LENGTH characters, the broadest and most common
+query while typing, can match most of the catalog, and summing all of its
+matches costs more than scanning the products. ProductSearchPrefix stores the
+score each product gets for every 1 to PREFIX_LENGTH character prefix of its
+terms, so such a query reads its best products from the front of an index
+range instead, however many products match. A longer single word usually
+starts only a few terms, and is ranked from the heads of those terms' rows in
+weight order, see search_word().
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Sum, When
+from django.dispatch import receiver
+
+from .models import Product, ProductSearchPrefix, ProductSearchTerm
+from .signals import catalog_changed
+
+FIELD_WEIGHTS = {"name": 3.0, "category__name": 2.0, "description": 1.0}
+PREFIX_WEIGHT = 0.5
+MAX_TERM_LENGTH = 50
+MAX_QUERY_TERMS = 8
+PREFIX_LENGTH = 5
+# The most terms search_word() reads the heads of.
+MAX_WORD_TERMS = 8
+
+WORD = re.compile(r"\w+")
+
+
+def terms(text):
+    """
+    Split text into casefolded, accent-free words.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [word[:MAX_TERM_LENGTH] for word in WORD.findall(text)]
+
+
+def term_weights(fields):
+    """
+    Weigh each term of a product by its fields, dampening repeated words.
+    """
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term, count in Counter(terms(fields[field] or "")).items():
+            weights[term] += weight * (1 + math.log(count))
+    return weights
+
+
+def prefix_scores(weights):
+    """
+    Score a product for each of its terms' 1 to PREFIX_LENGTH leading
+    characters as search_terms() would for that single partial word: the
+    weight of the term equal to it in full, the others' at PREFIX_WEIGHT.
+    """
+    prefixes = Counter()
+    for term, weight in weights.items():
+        for length in range(1, min(len(term), PREFIX_LENGTH) + 1):
+            prefixes[term[:length]] += weight * PREFIX_WEIGHT
+    for prefix in prefixes:
+        prefixes[prefix] += weights.get(prefix, 0) * (1 - PREFIX_WEIGHT)
+    return prefixes
+
+
+def query_terms(query):
+    return list(dict.fromkeys(terms(query)))[:MAX_QUERY_TERMS]
+
+
+def prefix_range(word):
+    upper = word[:-1] + chr(ord(word[-1]) + 1)
+    return Q(term__gte=word, term__lt=upper)
+
+
+def search_products(query, limit):
+    """
+    Return the ids of the best `limit` products matching `query`, best first.
+    """
+    words = query_terms(query)
+    if not words:
+        return []
+    *complete, partial = words
+    if not complete:
+        if len(partial) <= PREFIX_LENGTH:
+            return search_prefix(partial, limit)
+        ranked = search_word(partial, limit)
+        if ranked is not None:
+            return ranked
+    return search_terms(complete, partial, limit)
+
+
+def term_score(words):
+    """
+    Score a match row: a term that only extends the last word counts for less
+    than an exact one.
+    """
+    return Case(
+        When(term__in=words, then=F("weight")),
+        default=F("weight") * PREFIX_WEIGHT,
+    )
+
+
+def search_terms(complete, partial, limit):
+    """
+    Rank the products holding every `complete` word and a term starting with
+    `partial` from ProductSearchTerm.
+    """
+    words = [*complete, partial]
+    lookups = [Q(term=word) for word in complete] + [prefix_range(partial)]
+
+    matches = ProductSearchTerm.objects.filter(reduce(or_, lookups))
+    if complete:
+        products = None
+        for lookup in lookups:
+            rows = ProductSearchTerm.objects.filter(lookup)
+            if products is not None:
+                rows = rows.filter(product__in=products)
+            products = rows.values("product")
+        matches = matches.filter(product__in=products)
+
+    ranked = (
+        matches.values("product")
+        .annotate(score=Sum(term_score(words)))
+        .order_by("-score", "-product")
+        .values_list("product", flat=True)
+    )
+    return list(ranked[:limit])
+
+
+def search_prefix(word, limit):
+    """
+    Rank the products for a single partial word from ProductSearchPrefix.
+    """
+    ranked = (
+        ProductSearchPrefix.objects.filter(prefix=word)
+        .order_by("-score", "-product")
+        .values_list("product", flat=True)
+    )
+    return list(ranked[:limit])
+
+
+def range_terms(word, most):
+    """
+    The distinct terms starting with `word`, at most `most` of them, found by
+    one index seek each.
+    """
+    rows = ProductSearchTerm.objects.filter(prefix_range(word)).order_by("term")
+    found = []
+    while len(found) < most:
+        after = rows.filter(term__gt=found[-1]) if found else rows
+        term = after.values_list("term", flat=True).first()
+        if term is None:
+            break
+        found.append(term)
+    return found
+
+
+def search_word(word, limit):
+    """
+    Rank the products for a single partial word longer than PREFIX_LENGTH from
+    the best `limit` rows of each term it starts, or return None when those
+    cannot settle the ranking.
+
+    Another product has at most the weight of the last row read in each term
+    that had more rows, so the ranking is exact when the last of the best
+    `limit` scores beats the sum of those weights.
+    """
+    terms = range_terms(word, MAX_WORD_TERMS + 1)
+    if len(terms) > MAX_WORD_TERMS:
+        return None
+
+    heads = {
+        term: list(
+            ProductSearchTerm.objects.filter(term=term)
+            .order_by("-weight", "-product")
+            .values_list("product", "weight")[:limit]
+        )
+        for term in terms
+    }
+    if len(heads) < 2:
+        # Scores are the weights times one factor, in the same order.
+        return [product for rows in heads.values() for product, _ in rows]
+
+    bound = sum(
+        rows[-1][1] * (1 if term == word else PREFIX_WEIGHT)
+        for term, rows in heads.items()
+        if len(rows) == limit
+    )
+    candidates = {product for rows in heads.values() for product, _ in rows}
+    scores = dict(
+        ProductSearchTerm.objects.filter(term__in=terms, product__in=candidates)
+        .values("product")
+        .annotate(score=Sum(term_score([word])))
+        .values_list("product", "score")
+    )
+    ranked = sorted(
+        scores, key=lambda product: (scores[product], product), reverse=True
+    )[:limit]
+    if bound and scores[ranked[-1]] <= bound:
+        return None
+    return ranked
+
+
+def index_products(product_ids):
+    """
+    Bring the index rows of the given products up to date; inactive ones are
+    dropped.
+
+    The terms only depend on the name, description and category name, while
+    catalog_changed is also sent for line, image and attribute changes. The
+    stored terms are compared first, and only products whose terms differ are
+    rewritten, in both indexes.
+    """
+    product_ids = set(product_ids)
+    products = Product.objects.filter(pk__in=product_ids, is_active=True).values(
+        "pk", *FIELD_WEIGHTS
+    )
+    wanted = {product["pk"]: dict(term_weights(product)) for product in products}
+    indexed = defaultdict(dict)
+    for product_id, term, weight in ProductSearchTerm.objects.filter(
+        product__in=product_ids
+    ).values_list("product", "term", "weight"):
+        indexed[product_id][term] = weight
+    changed = {pk for pk in product_ids if wanted.get(pk, {}) != indexed[pk]}
+    if not changed:
+        return
+
+    rows = [
+        ProductSearchTerm(product_id=pk, term=term, weight=weight)
+        for pk in changed & wanted.keys()
+        for term, weight in wanted[pk].items()
+    ]
+    prefix_rows = [
+        ProductSearchPrefix(product_id=pk, prefix=prefix, score=score)
+        for pk in changed & wanted.keys()
+        for prefix, score in prefix_scores(wanted[pk]).items()
+    ]
+    with transaction.atomic():
+        ProductSearchTerm.objects.filter(product__in=changed).delete()
+        ProductSearchPrefix.objects.filter(product__in=changed).delete()
+        ProductSearchTerm.objects.bulk_create(rows)
+        ProductSearchPrefix.objects.bulk_create(prefix_rows)
+
+
+@receiver(catalog_changed)
+def index_changed_products(sender, product_ids, **kwargs):
+    index_products(product_ids)
@@ -1,4 +1,7 @@
+from django.db.models.fields.files import FieldFile
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from .models import (
     AttributeValue,
@@ -18,6 +21,22 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ["category_name"]
 
 
+class CategoryTreeSerializer(serializers.ModelSerializer):
+    category_name = serializers.CharField(source="name")
+    children = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Category
+        fields = ["category_name", "slug", "children"]
+
+    @extend_schema_field(serializers.ListField(child=serializers.DictField()))
+    def get_children(self, obj):
+        # Children come from the get_cached_trees() cache; inactive
+        # categories are dropped together with their subtree.
+        children = [child for child in obj.get_children() if child.is_active]
+        return CategoryTreeSerializer(children, many=True).data
+
+
 class ProductImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProductImage
@@ -61,6 +80,12 @@ class ProductLineSerializer(serializers.ModelSerializer):
         return data
 
 
+class SkuSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductLine
+        fields = ["sku", "price", "stock_qty", "is_active"]
+
+
 class ProductSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source="category.name")
     product_line = ProductLineSerializer(many=True)
@@ -80,9 +105,8 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
 
     def get_attributes(self, obj):
-        attributes = Attribute.objects.filter(
-            product_type_attribute__product__id=obj.id
-        )
+        # Reads from the `product_type__attribute` prefetch cache when present.
+        attributes = obj.product_type.attribute.all()
 
         return AttributeSerializer(attributes, many=True).data
 
@@ -92,3 +116,136 @@ class ProductSerializer(serializers.ModelSerializer):
         attr = {av["id"]: av["name"] for av in av_data}
         data.update({"type specification": attr})
         return data
+
+
+# Read-only fast path for ProductSerializer.
+#
+# Builds the same dicts, in the same key order, with plain attribute access
+# instead of DRF's per-field binding, get_attribute() and to_representation()
+# calls. Prices go through the field instance ProductSerializer uses, so their
+# formatting cannot drift. Products must be loaded with
+# ProductQuerySet.for_api().
+_PRICE = ProductLineSerializer().fields["price"]
+_IMAGE_URL = ProductImageSerializer().fields["url"]
+_IMAGE_STORAGE = ProductImage._meta.get_field("url").storage
+
+
+def _prefetched(instance, name):
+    """
+    Rows of a prefetched relation, without creating a related manager.
+    """
+    try:
+        return instance._prefetched_objects_cache[name]
+    except (AttributeError, KeyError):
+        return getattr(instance, name).all()
+
+
+def _image_url(image):
+    # The model stores the file name until the attribute is first read, so
+    # the url can be built without creating an ImageFieldFile.
+    value = image.__dict__.get("url")
+    if value is None or not api_settings.UPLOADED_FILES_USE_URL:
+        return _IMAGE_URL.to_representation(image.url)
+    name = value.name if isinstance(value, FieldFile) else value
+    return _IMAGE_STORAGE.url(name) if name else None
+
+
+def serialize_product_image(image):
+    return {
+        "url": _image_url(image),
+        "alternative_text": image.alternative_text,
+        "order": image.order,
+    }
+
+
+def serialize_product_line(line):
+    return {
+        "price": _PRICE.to_representation(line.price),
+        "sku": line.sku,
+        "stock_qty": line.stock_qty,
+        "is_active": line.is_active,
+        "product_image": [
+            serialize_product_image(image)
+            for image in _prefetched(line, "product_image")
+        ],
+        "specification": {
+            value.attribute.id: value.attribute_value
+            for value in _prefetched(line, "attribute_value")
+        },
+    }
+
+
+def serialize_product(product):
+    """
+    Return exactly what ProductSerializer(product).data renders to.
+    """
+    return {
+        "name": product.name,
+        "slug": product.slug,
+        "description": product.description,
+        "is_digital": product.is_digital,
+        "is_active": product.is_active,
+        "category_name": product.category.name,
+        "product_line": [
+            serialize_product_line(line)
+            for line in _prefetched(product, "product_line")
+        ],
+        "type specification": {
+            attribute.id: attribute.name
+            for attribute in _prefetched(product.product_type, "attribute")
+        },
+    }
+
+
+# Sparse variant of the fast path for the `fields` and `expand` query
+# parameters. `fields` is a tree built by fieldsets.parse_fieldset(): each
+# name maps to None for a plain field or to the subtree of a relation. Keys
+# keep ProductSerializer's order.
+def _sparse(instance, fields, values):
+    return {name: values[name](instance, subtree) for name, subtree in fields.items()}
+
+
+_PRODUCT_IMAGE_VALUES = {
+    "url": lambda image, _: _image_url(image),
+    "alternative_text": lambda image, _: image.alternative_text,
+    "order": lambda image, _: image.order,
+}
+
+_PRODUCT_LINE_VALUES = {
+    "price": lambda line, _: _PRICE.to_representation(line.price),
+    "sku": lambda line, _: line.sku,
+    "stock_qty": lambda line, _: line.stock_qty,
+    "is_active": lambda line, _: line.is_active,
+    "product_image": lambda line, fields: [
+        _sparse(image, fields, _PRODUCT_IMAGE_VALUES)
+        for image in _prefetched(line, "product_image")
+    ],
+    "specification": lambda line, _: {
+        value.attribute_id: value.attribute_value
+        for value in _prefetched(line, "attribute_value")
+    },
+}
+
+_PRODUCT_VALUES = {
+    "name": lambda product, _: product.name,
+    "slug": lambda product, _: product.slug,
+    "description": lambda product, _: product.description,
+    "is_digital": lambda product, _: product.is_digital,
+    "is_active": lambda product, _: product.is_active,
+    "category_name": lambda product, _: product.category.name,
+    "product_line": lambda product, fields: [
+        _sparse(line, fields, _PRODUCT_LINE_VALUES)
+        for line in _prefetched(product, "product_line")
+    ],
+    "type specification": lambda product, _: {
+        attribute.id: attribute.name
+        for attribute in _prefetched(product.product_type, "attribute")
+    },
+}
+
+
+def serialize_product_fields(product, fields):
+    """
+    Return the parts of serialize_product(product) selected by `fields`.
+    """
+    return _sparse(product, fields, _PRODUCT_VALUES)
@@ -0,0 +1,155 @@
+from weakref import WeakKeyDictionary
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductImage,
+    ProductLine,
+    ProductLineAttributeValue,
+    ProductTypeAttribute,
+)
+
+# Sent with `product_ids` whenever anything a product's API representation is
+# built from changes, once the write has committed. Code that writes with
+# queryset.update() or bulk_create() bypasses the model signals below and must
+# call notify() itself.
+catalog_changed = Signal()
+
+# Product ids changed in each connection's current transaction, not sent yet.
+_pending = WeakKeyDictionary()
+
+
+def notify(product_ids):
+    """
+    Send catalog_changed for `product_ids` when the current transaction
+    commits, or right away outside a transaction.
+
+    Ids noted within one transaction are sent together, once, so saving a
+    product's lines, images and values one row at a time rebuilds it once.
+    """
+    product_ids = {pk for pk in product_ids if pk is not None}
+    if not product_ids:
+        return
+    connection = transaction.get_connection()
+    _pending.setdefault(connection, set()).update(product_ids)
+    # Registered on every call: if the transaction that first noted ids rolls
+    # back, its callback is dropped, and the ids go out with the next commit.
+    # Robust: the write has committed, so a failure rebuilding the documents
+    # is logged rather than reported to the caller as a failed save.
+    transaction.on_commit(lambda: send_pending(connection), robust=True)
+
+
+def send_pending(connection):
+    product_ids = _pending.pop(connection, None)
+    if product_ids:
+        catalog_changed.send(sender=Product, product_ids=product_ids)
+
+
+def products_for_lines(line_ids):
+    return ProductLine.objects.filter(pk__in=line_ids).values_list(
+        "product_id", flat=True
+    )
+
+
+def products_for_types(type_ids):
+    return Product.objects.filter(product_type_id__in=type_ids).values_list(
+        "pk", flat=True
+    )
+
+
+@receiver(post_save, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    notify([instance.pk])
+
+
+@receiver(post_save, sender=ProductLine)
+@receiver(post_delete, sender=ProductLine)
+def product_line_changed(sender, instance, **kwargs):
+    notify([instance.product_id])
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def product_image_changed(sender, instance, **kwargs):
+    notify(products_for_lines([instance.product_line_id]))
+
+
+@receiver(post_save, sender=ProductLineAttributeValue)
+@receiver(post_delete, sender=ProductLineAttributeValue)
+def product_line_attribute_value_changed(sender, instance, **kwargs):
+    notify(products_for_lines([instance.product_line_id]))
+
+
+@receiver(post_save, sender=ProductTypeAttribute)
+@receiver(post_delete, sender=ProductTypeAttribute)
+def product_type_attribute_changed(sender, instance, **kwargs):
+    notify(products_for_types([instance.product_type_id]))
+
+
+@receiver(m2m_changed, sender=ProductLineAttributeValue)
+def product_line_attribute_values_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        notify([instance.product_id])
+    elif pk_set:
+        notify(products_for_lines(pk_set))
+
+
+@receiver(m2m_changed, sender=ProductTypeAttribute)
+def product_type_attributes_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        notify(products_for_types([instance.pk]))
+    elif pk_set:
+        notify(products_for_types(pk_set))
+
+
+@receiver(post_save, sender=Category)
+def category_changed(sender, instance, created, **kwargs):
+    if not created:
+        notify(Product.objects.filter(category=instance).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Attribute)
+def attribute_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    notify(
+        products_for_types(
+            ProductTypeAttribute.objects.filter(attribute=instance).values_list(
+                "product_type_id", flat=True
+            )
+        )
+    )
+    notify(
+        products_for_lines(
+            ProductLineAttributeValue.objects.filter(
+                attribute_value__attribute=instance
+            ).values_list("product_line_id", flat=True)
+        )
+    )
+
+
+@receiver(post_save, sender=AttributeValue)
+def attribute_value_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    notify(
+        products_for_lines(
+            ProductLineAttributeValue.objects.filter(
+                attribute_value=instance
+            ).values_list("product_line_id", flat=True)
+        )
+    )
@@ -0,0 +1,110 @@
+"""
+Batch SKU lookups for cart and checkout services.
+
+The price, stock and active flag of each SKU are kept in the in-process SKU
+cache (settings.SKU_CACHE), a LocMemCache that evicts the least recently used
+entries past MAX_ENTRIES and expires them after a short TTL. A lookup reads
+every requested SKU from the cache at once and loads the rest with a single
+query, however many SKUs are asked for.
+
+Entries are deleted on catalog_changed for every line of the changed
+products, which is sent on ProductLine saves and by update() writers such as
+stock reservations and imports, and for the old SKU of a renamed or deleted
+ProductLine. All of them wait for the transaction to commit, so that a lookup
+made meanwhile cannot put the old row back. Other processes keep their copy
+until it expires.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.exceptions import ValidationError
+
+from ..db import cache_timeout
+from .models import ProductLine
+from .serializers import SkuSerializer
+from .signals import catalog_changed
+
+MAX_SKUS = 500
+
+
+def sku_cache():
+    return caches[settings.SKU_CACHE]
+
+
+def sku_key(sku):
+    digest = hashlib.md5(sku.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"sku:{digest}"
+
+
+def parse_skus(query_params):
+    value = query_params.get("sku")
+    if value is None:
+        raise ValidationError({"sku": ["This query parameter is required."]})
+    skus = list(dict.fromkeys(sku.strip() for sku in value.split(",") if sku.strip()))
+    if len(skus) > MAX_SKUS:
+        raise ValidationError({"sku": [f"At most {MAX_SKUS} SKUs per request."]})
+    return skus
+
+
+def lookup_skus(skus):
+    """
+    Return the SkuSerializer data of the known SKUs among `skus`, in the order
+    given; unknown SKUs are left out.
+    """
+    cache = sku_cache()
+    keys = {sku: sku_key(sku) for sku in skus}
+    cached = cache.get_many(keys.values())
+    found = {sku: cached[key] for sku, key in keys.items() if key in cached}
+
+    missing = [sku for sku in skus if sku not in found]
+    if missing:
+        lines = ProductLine.objects.filter(sku__in=missing).only(
+            *SkuSerializer.Meta.fields
+        )
+        loaded = {item["sku"]: item for item in SkuSerializer(lines, many=True).data}
+        cache.set_many(
+            {keys[sku]: item for sku, item in loaded.items()},
+            cache_timeout(cache.default_timeout),
+        )
+        found.update(loaded)
+
+    return [found[sku] for sku in skus if sku in found]
+
+
+def invalidate_skus(skus):
+    sku_cache().delete_many([sku_key(sku) for sku in skus])
+
+
+@receiver(pre_save, sender=ProductLine)
+def invalidate_renamed_line(sender, instance, raw=False, **kwargs):
+    """
+    Evict the SKU a line is leaving when its SKU changes; catalog_changed only
+    reaches the SKUs the product's lines have after the write.
+    """
+    if raw or instance.pk is None:
+        return
+    sku = (
+        ProductLine.objects.filter(pk=instance.pk).values_list("sku", flat=True).first()
+    )
+    if sku is not None and sku != instance.sku:
+        transaction.on_commit(lambda: invalidate_skus([sku]), robust=True)
+
+
+@receiver(post_delete, sender=ProductLine)
+def invalidate_deleted_line(sender, instance, **kwargs):
+    sku = instance.sku
+    transaction.on_commit(lambda: invalidate_skus([sku]), robust=True)
+
+
+@receiver(catalog_changed)
+def invalidate_changed_skus(sender, product_ids, **kwargs):
+    invalidate_skus(
+        ProductLine.objects.filter(product__in=product_ids).values_list(
+            "sku", flat=True
+        )
+    )
@@ -0,0 +1,76 @@
+"""
+Stock reservation for checkout.
+
+reserve_stock() takes quantities of several SKUs in one transaction, each with
+a single conditional UPDATE (`SET stock_qty = stock_qty - n WHERE stock_qty >=
+n`). The database checks and decrements in one step under the row's write
+lock, so concurrent checkouts can never take more than is in stock, and no
+ProductLine is loaded, validated or saved. Rows are updated in SKU order so
+that overlapping batches lock them in the same order and cannot deadlock.
+
+As update() sends no model signals, the products are passed to notify(),
+which sends catalog_changed once the transaction has committed.
+"""
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import ProductLine
+from .signals import notify
+
+
+class InsufficientStock(Exception):
+    """
+    Raised, with nothing reserved, when some SKUs are short of stock, inactive
+    or unknown.
+    """
+
+    def __init__(self, skus):
+        self.skus = skus
+        super().__init__(f"Insufficient stock for: {', '.join(skus)}")
+
+
+def check_quantities(quantities):
+    quantities = dict(quantities)
+    for sku, quantity in quantities.items():
+        if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+            raise ValueError(f"Quantity for {sku} must be a positive integer")
+    return quantities
+
+
+def reserve_stock(quantities):
+    """
+    Take `quantities`, a mapping of SKU to units, from stock: either all of it
+    or, raising InsufficientStock, none of it.
+    """
+    quantities = check_quantities(quantities)
+    with transaction.atomic():
+        short = []
+        for sku, quantity in sorted(quantities.items()):
+            updated = ProductLine.objects.filter(
+                sku=sku, is_active=True, stock_qty__gte=quantity
+            ).update(stock_qty=F("stock_qty") - quantity)
+            if not updated:
+                short.append(sku)
+        if short:
+            # Rolls back the updates that did succeed.
+            raise InsufficientStock(short)
+        notify(products_for_skus(quantities))
+
+
+def release_stock(quantities):
+    """
+    Return `quantities`, a mapping of SKU to units, to stock, e.g. for an
+    abandoned checkout.
+    """
+    quantities = check_quantities(quantities)
+    with transaction.atomic():
+        for sku, quantity in sorted(quantities.items()):
+            ProductLine.objects.filter(sku=sku).update(
+                stock_qty=F("stock_qty") + quantity
+            )
+        notify(products_for_skus(quantities))
+
+
+def products_for_skus(skus):
+    return ProductLine.objects.filter(sku__in=skus).values_list("product_id", flat=True)
@@ -0,0 +1,44 @@
+"""
+Per-product price and stock summary.
+
+Product.min_price, max_price and stock_qty summarize the product's active
+lines. They are refreshed with a single UPDATE whenever catalog_changed fires
+for the product, so listings filter and sort on them directly.
+"""
+
+from django.db.models import Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import receiver
+
+from .models import Product, ProductLine
+from .signals import catalog_changed
+
+
+def summary_columns(product_model, line_model):
+    """
+    Correlated subqueries computing each summary column from the lines.
+    """
+    lines = line_model.objects.filter(product=OuterRef("pk"), is_active=True).values(
+        "product"
+    )
+
+    def aggregate(function):
+        return Subquery(lines.annotate(value=function).values("value"))
+
+    return {
+        "min_price": aggregate(Min("price")),
+        "max_price": aggregate(Max("price")),
+        "stock_qty": Coalesce(aggregate(Sum("stock_qty")), Value(0)),
+    }
+
+
+def refresh_summaries(product_ids):
+    # update() sends no signals, so this never feeds back into catalog_changed.
+    Product.objects.filter(pk__in=set(product_ids)).update(
+        **summary_columns(Product, ProductLine)
+    )
+
+
+@receiver(catalog_changed)
+def refresh_changed_summaries(sender, product_ids, **kwargs):
+    refresh_summaries(product_ids)
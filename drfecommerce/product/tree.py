@@ -0,0 +1,50 @@
+from django.db import router
+from mptt.utils import get_cached_trees
+
+from .conditional import listing_aggregates
+from .models import Category
+from .serializers import CategoryTreeSerializer
+
+# Per-process copy of the serialized tree, keyed by the state of the category
+# table it was built from.
+_tree = {}
+
+
+def build_category_tree(using=None):
+    """
+    Serialize the active category tree from a single ordered query.
+    """
+    nodes = (
+        Category.objects.using(using)
+        .order_by("tree_id", "lft")
+        .only("name", "slug", "is_active", "parent", "tree_id", "lft", "rght", "level")
+    )
+    roots = [node for node in get_cached_trees(nodes) if node.is_active]
+    return CategoryTreeSerializer(roots, many=True).data
+
+
+def category_tree_version(using=None):
+    """
+    The latest category update time and the category count, read from the
+    database so that a change made by any process is seen by every process.
+
+    An insert, edit, move or activation saves a category and moves the update
+    time forward; a delete changes the count.
+    """
+    state = Category.objects.using(using).aggregate(**listing_aggregates("updated_at"))
+    return state["last_modified"], state["count"]
+
+
+def category_tree():
+    # Read the version before building so that a change made mid-build leaves
+    # the stored copy already stale rather than hiding the change, and both
+    # from the same database, so that a lagging replica's tree is stored under
+    # that replica's version.
+    using = router.db_for_read(Category)
+    version = category_tree_version(using)
+    cached = _tree.get("tree")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    data = build_category_tree(using)
+    _tree["tree"] = (version, data)
+    return data
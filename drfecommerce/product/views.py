@@ -1,62 +1,300 @@
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
 from rest_framework.response import Response
-from .models import Category, Product
-from .serializers import CategorySerializer, ProductSerializer
-from drf_spectacular.utils import extend_schema
+from ..db import ReplicaReadsMixin
+from .cache import cache_response
+from .conditional import (
+    category_list_validators,
+    conditional,
+    product_list_validators,
+    product_validators,
+)
+from .documents import (
+    document_response,
+    documents_for,
+    paginated_document_response,
+    results_document_response,
+    with_document_version,
+    with_documents,
+)
+from .export import export_queryset, ndjson_chunks
+from .facets import facet_counts, filter_products, parse_attr_filters, wants_facets
+from .filters import filter_listing, parse_listing_filters
+from .fieldsets import apply_fieldset, parse_fieldset
+from .models import Category, Product, ProductLine
+from .pagination import ProductCursorPagination
+from .search import search_products
+from .serializers import (
+    CategorySerializer,
+    CategoryTreeSerializer,
+    ProductSerializer,
+    SkuSerializer,
+    serialize_product_fields,
+)
+from .skus import MAX_SKUS, lookup_skus, parse_skus
+from .tree import category_tree
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
 from rest_framework.decorators import action
-from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
 
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        str,
+        description="Comma-separated fields to return, dotted for nested ones, "
+        "e.g. name,slug,product_line.price",
+    ),
+    OpenApiParameter(
+        "expand",
+        str,
+        description="Comma-separated relations to include: product_line, "
+        "product_line.product_image, product_line.specification, "
+        "type_specification",
+    ),
+]
 
-class CategoryViewSet(viewsets.ViewSet):
+LISTING_PARAMETERS = [
+    OpenApiParameter(
+        "price_min",
+        float,
+        description="Keep products with a line at this price or more",
+    ),
+    OpenApiParameter(
+        "price_max",
+        float,
+        description="Keep products with a line at this price or less",
+    ),
+    OpenApiParameter(
+        "in_stock", bool, description="Keep products with stock on an active line"
+    ),
+]
+
+FACET_PARAMETERS = [
+    OpenApiParameter(
+        "attr",
+        str,
+        many=True,
+        description="Attribute filter as <attribute_id>:<value>. Repeat it to "
+        "accept several values of an attribute or to require several attributes",
+    ),
+    OpenApiParameter(
+        "facets",
+        bool,
+        description="Include the listing's product counts per attribute value",
+    ),
+]
+
+
+class CategoryViewSet(ReplicaReadsMixin, viewsets.ViewSet):
 
     queryset = Category.objects.all().is_active()
 
     @extend_schema(responses=CategorySerializer)
+    @cache_response("categories")
+    @conditional(category_list_validators)
     def list(self, request):
         """
         Endpoint to retrieve all categories
         """
-        serializer = CategorySerializer(self.queryset, many=True)
+        # .all() so the class-level queryset's result cache is never reused.
+        serializer = CategorySerializer(self.queryset.all(), many=True)
         return Response(serializer.data)
 
+    @extend_schema(responses=CategoryTreeSerializer(many=True))
+    @action(detail=False, methods=["get"])
+    def tree(self, request):
+        """
+        Endpoint to retrieve the nested tree of active categories
+        """
+        return Response(category_tree())
+
 
-class ProductViewSet(viewsets.ViewSet):
+class ProductViewSet(ReplicaReadsMixin, viewsets.ViewSet):
 
     queryset = Product.objects.all().is_active()
     lookup_field = "slug"
+    pagination_class = ProductCursorPagination
+
+    def get_list_queryset(self, request, slug=None):
+        # Memoized on the view instance, which DRF creates per request, so the
+        # conditional GET validators and the action share one category lookup.
+        if not hasattr(self, "_list_queryset"):
+            queryset = filter_listing(
+                self._build_list_queryset(request, slug),
+                parse_listing_filters(request.query_params),
+            )
+            self._list_queryset = filter_products(
+                queryset, parse_attr_filters(request.query_params)
+            )
+        return self._list_queryset
+
+    def _build_list_queryset(self, request, slug):
+        if slug is None:
+            return self.queryset
+        if request.query_params.get("subtree") not in ("true", "1"):
+            return self.queryset.filter(category__slug=slug)
+
+        category = (
+            Category.objects.filter(slug=slug).only("tree_id", "lft", "rght").first()
+        )
+        if category is None:
+            return self.queryset.none()
+        return self.queryset.in_category_tree(category)
 
+    def get_page(self, request, queryset):
+        # Memoized like get_list_queryset(): the conditional GET validators are
+        # computed from the same page the action renders.
+        if not hasattr(self, "_page"):
+            self._paginator = self.pagination_class()
+            fields = self.get_fieldset(request)
+            if fields is None:
+                queryset = with_documents(queryset.only(*self._paginator.cursor_fields))
+            else:
+                queryset = with_document_version(apply_fieldset(queryset, fields))
+            self._page = self._paginator.paginate_queryset(queryset, request, view=self)
+        return self._paginator, self._page
+
+    def get_fieldset(self, request):
+        return parse_fieldset(request.query_params)
+
+    def get_facets(self, request, queryset):
+        # Memoized like get_page(); None unless the client asked for facets.
+        if not hasattr(self, "_facets"):
+            self._facets = None
+            if wants_facets(request.query_params):
+                self._facets = facet_counts(queryset)
+        return self._facets
+
+    def paginated_response(self, request, queryset):
+        paginator, page = self.get_page(request, queryset)
+        facets = self.get_facets(request, queryset)
+        fields = self.get_fieldset(request)
+        if fields is not None:
+            response = paginator.get_paginated_response(
+                [serialize_product_fields(product, fields) for product in page]
+            )
+            if facets is not None:
+                response.data["facets"] = facets
+            return response
+        return paginated_document_response(paginator, documents_for(page), facets)
+
+    @extend_schema(parameters=FIELDSET_PARAMETERS)
+    @cache_response("product:{slug}")
+    @conditional(product_validators)
     def retrieve(self, request, slug=None):
         """
         Endpoint to retrieve a single product
         """
-        serializer = ProductSerializer(
-            self.queryset.filter(slug=slug)
-            .select_related("category")
-            .prefetch_related(Prefetch("product_line__product_image"))
-            .prefetch_related(Prefetch("product_line__attribute_value__attribute")),
-            many=True,
-        )
+        fields = self.get_fieldset(request)
+        if fields is not None:
+            products = apply_fieldset(self.queryset.filter(slug=slug), fields)
+            return Response(
+                [serialize_product_fields(product, fields) for product in products]
+            )
+        products = with_documents(self.queryset.filter(slug=slug).only("pk"))
+        return document_response(documents_for(products))
 
-        return Response(serializer.data)
-
-    @extend_schema(responses=ProductSerializer)
+    @extend_schema(
+        responses=ProductSerializer,
+        parameters=[*FIELDSET_PARAMETERS, *LISTING_PARAMETERS, *FACET_PARAMETERS],
+    )
+    @cache_response("products")
+    @conditional(product_list_validators)
     def list(self, request):
         """
-        Endpoint to retrieve all products
+        Endpoint to retrieve all products, optionally filtered by attribute
+        values with `?attr=`
         """
-        serializer = ProductSerializer(self.queryset, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(request, self.get_list_queryset(request))
 
+    @extend_schema(responses={(200, "application/x-ndjson"): ProductSerializer})
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Endpoint to stream every active product as JSON Lines
+        """
+        queryset = export_queryset()
+        # Resolve the database now: the stream is read after the request's
+        # routing state is gone.
+        queryset = queryset.using(queryset.db)
+        chunks = (chunk.encode("utf-8") for chunk in ndjson_chunks(queryset))
+        return StreamingHttpResponse(chunks, content_type="application/x-ndjson")
+
+    @extend_schema(
+        responses=inline_serializer(
+            "ProductSearchResults",
+            {"results": ProductSerializer(many=True)},
+        ),
+        parameters=[
+            OpenApiParameter(
+                "q",
+                str,
+                required=True,
+                description="Words to find in product names, descriptions and "
+                "category names, matched as word prefixes",
+            ),
+            OpenApiParameter("page_size", int, description="Number of results"),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    @cache_response("products")
+    def search(self, request):
+        """
+        Endpoint to search active products, best matches first
+        """
+        query = request.query_params.get("q")
+        if query is None:
+            raise ValidationError({"q": ["This query parameter is required."]})
+        limit = self.pagination_class().get_page_size(request)
+        ranked = search_products(query, limit)
+        products = with_documents(self.queryset.filter(pk__in=ranked).only("pk"))
+        products = sorted(products, key=lambda product: ranked.index(product.pk))
+        return results_document_response(documents_for(products))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "subtree",
+                bool,
+                description="Include products of all descendant categories",
+            ),
+            *FIELDSET_PARAMETERS,
+            *LISTING_PARAMETERS,
+            *FACET_PARAMETERS,
+        ]
+    )
     @action(
         detail=False,
         methods=["get"],
         url_path=r"category/(?P<slug>\w+)/all",
     )
+    @cache_response("category:{slug}", "category-tree")
+    @conditional(product_list_validators)
     def list_product_by_slug(self, request, slug=None):
         """
-        Endpoint to retrieve products by category
+        Endpoint to retrieve products by category, or by category subtree with
+        `?subtree=true`
         """
-        serializer = ProductSerializer(
-            self.queryset.filter(category__slug=slug), many=True
-        )
-        return Response(serializer.data)
+        return self.paginated_response(request, self.get_list_queryset(request, slug))
+
+
+class SkuViewSet(ReplicaReadsMixin, viewsets.ViewSet):
+
+    queryset = ProductLine.objects.all()
+
+    @extend_schema(
+        responses=SkuSerializer(many=True),
+        parameters=[
+            OpenApiParameter(
+                "sku",
+                str,
+                required=True,
+                description=f"Comma-separated SKUs, at most {MAX_SKUS}",
+            ),
+        ],
+    )
+    def list(self, request):
+        """
+        Endpoint to look up the price, stock and active flag of a batch of SKUs
+        """
+        return Response(lookup_skus(parse_skus(request.query_params)))
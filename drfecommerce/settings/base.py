@@ -35,6 +35,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "drfecommerce.db.PrimaryPinMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -46,6 +47,15 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "drfecommerce.urls"
 
+# Catalog reads are spread over these database aliases; writes always go to
+# "default". A client that wrote reads from "default" for REPLICA_PIN_SECONDS,
+# which should exceed the replication lag.
+DATABASE_ROUTERS = ["drfecommerce.db.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = [
+    alias for alias in os.environ.get("DATABASE_REPLICAS", "").split(",") if alias
+]
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -68,6 +78,44 @@ WSGI_APPLICATION = "drfecommerce.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# The catalog cache holds rendered API responses. LocMemCache evicts least
+# recently used entries once MAX_ENTRIES is reached; point it at
+# django.core.cache.backends.filebased.FileBasedCache to share it between
+# processes on one host.
+CATALOG_CACHE = "catalog"
+
+# The SKU cache holds the price, stock and active flag of single SKUs for the
+# batch lookup endpoint. It is deliberately per process: writes invalidate the
+# local copy, and the short TTL bounds how stale other processes can be.
+SKU_CACHE = "skus"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    CATALOG_CACHE: {
+        "BACKEND": os.environ.get(
+            "CATALOG_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CATALOG_CACHE_LOCATION", "catalog"),
+        "TIMEOUT": int(os.environ.get("CATALOG_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", 5000)),
+        },
+    },
+    SKU_CACHE: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "skus",
+        "TIMEOUT": int(os.environ.get("SKU_CACHE_TIMEOUT", 10)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("SKU_CACHE_MAX_ENTRIES", 20000)),
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -105,8 +153,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "drfecommerce.product.pagination.ProductCursorPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", 20)),
+    "DEFAULT_RENDERER_CLASSES": [
+        "drfecommerce.product.renderers.CatalogJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
+# Encode JSON responses with orjson when it is installed; otherwise, or when
+# disabled, CatalogJSONRenderer behaves exactly like DRF's JSONRenderer.
+FAST_JSON_RENDERER = os.environ.get("FAST_JSON_RENDERER", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Django DRF E-Commerce",
 }
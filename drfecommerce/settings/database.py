@@ -0,0 +1,56 @@
+"""
+Database settings read from DATABASE_* environment variables.
+
+DATABASE_CONN_MAX_AGE keeps a connection open across requests for that many
+seconds, and DATABASE_CONN_HEALTH_CHECKS makes Django ping a reused
+connection before the first query of a request, so a connection dropped by
+the server or a failover is replaced rather than failing the request.
+
+Django 5.0 has no connection pool, so there is no pool size to set: each
+worker thread keeps one persistent connection per database alias it uses. A
+deployment of P processes with T threads each holds up to P * T connections
+to the primary and as many to each replica, which must stay below the
+server's connection limit.
+"""
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def env_bool(environ, name, default):
+    value = environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def database_config(environ, name, host=None):
+    """
+    Build one DATABASES entry. `name` is the default DATABASE_NAME and `host`
+    overrides DATABASE_HOST, for replicas.
+    """
+    config = {
+        "ENGINE": environ.get("DATABASE_ENGINE", "django.db.backends.sqlite3"),
+        "NAME": environ.get("DATABASE_NAME", name),
+        "USER": environ.get("DATABASE_USER", ""),
+        "PASSWORD": environ.get("DATABASE_PASSWORD", ""),
+        "HOST": host or environ.get("DATABASE_HOST", ""),
+        "PORT": environ.get("DATABASE_PORT", ""),
+        "CONN_MAX_AGE": int(environ.get("DATABASE_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": env_bool(environ, "DATABASE_CONN_HEALTH_CHECKS", True),
+        "OPTIONS": {},
+    }
+    return config
+
+
+def databases(environ, name):
+    """
+    The primary as "default" plus one "replicaN" alias per host listed in
+    DATABASE_REPLICA_HOSTS, which otherwise share the primary's settings.
+    """
+    config = {"default": database_config(environ, name)}
+    hosts = environ.get("DATABASE_REPLICA_HOSTS", "").split(",")
+    hosts = [host.strip() for host in hosts if host.strip()]
+    for index, host in enumerate(hosts, start=1):
+        config[f"replica{index}"] = database_config(environ, name, host=host)
+        config[f"replica{index}"]["TEST"] = {"MIRROR": "default"}
+    return config
@@ -4,5 +4,15 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        # Tests use an in-memory database unless SQLITE_TEST_NAME points the
+        # test database at a file.
+        "TEST": {"NAME": os.environ.get("SQLITE_TEST_NAME")},
+    },
+    # A second SQLite file standing in for a read replica. Reads only go to it
+    # with DATABASE_REPLICAS=replica; keep it in sync by copying db.sqlite3.
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get("SQLITE_REPLICA_NAME", BASE_DIR / "db.replica.sqlite3"),
+        "TEST": {"MIRROR": "default"},
+    },
 }
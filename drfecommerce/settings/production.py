@@ -1,3 +1,7 @@
 from .base import *
+from .database import databases
 
 ALLOWED_HOSTS = ['*']
+
+DATABASES = databases(os.environ, BASE_DIR / 'db.sqlite3')
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
@@ -0,0 +1,42 @@
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def scale():
+    """
+    Multiplier for generated dataset sizes, e.g. BENCHMARK_SCALE=10.
+    """
+    return float(os.environ.get("BENCHMARK_SCALE", 1))
+
+
+@pytest.fixture
+def best_of():
+    def run(func, repeat=5):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    return run
+
+
+@pytest.fixture
+def report(capsys):
+    def write(name, **values):
+        fields = ", ".join(
+            (
+                f"{key}={value * 1000:.2f}ms"
+                if isinstance(value, float)
+                else f"{key}={value}"
+            )
+            for key, value in values.items()
+        )
+        with capsys.disabled():
+            print(f"\n[benchmark] {name}: {fields}")
+
+    return write
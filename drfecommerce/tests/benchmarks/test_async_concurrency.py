@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+async def load(path, requests, concurrency):
+    """
+    Keep `concurrency` requests in flight through the ASGI request path, as
+    an event-loop server would, and return (requests/s, p95 latency).
+    """
+    client = AsyncClient()
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(n):
+        async with slots:
+            start = time.perf_counter()
+            # A distinct query string misses the sync endpoint's response cache.
+            response = await client.get(f"{path}?n={n}")
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return int(requests / elapsed), latencies[int(len(latencies) * 0.95)]
+
+
+def test_async_vs_sync_product_list(
+    scale, report, product_factory, product_line_factory, api_client
+):
+    for product in product_factory.create_batch(20):
+        product_line_factory(product=product)
+    # Build the stored documents once.
+    api_client().get("/api/product/")
+
+    requests = int(400 * scale)
+    for concurrency in (1, 16, 64):
+        for name, path in [("sync", "/api/product/"), ("async", "/api/async/product/")]:
+            rps, p95 = async_to_sync(load)(path, requests, concurrency)
+            report(
+                f"product list {name}",
+                concurrency=concurrency,
+                requests=requests,
+                rps=rps,
+                p95=p95,
+            )
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...product.models import Category, Product
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+def build_tree(depth, width):
+    level = [
+        Category.objects.create(
+            name="root", slug="root", lft=0, rght=0, tree_id=0, level=0
+        )
+    ]
+    for d in range(1, depth):
+        level = Category.objects.bulk_create(
+            Category(
+                name=f"c_{d}_{p.pk}_{i}",
+                slug=f"c_{d}_{p.pk}_{i}",
+                parent=p,
+                lft=0,
+                rght=0,
+                tree_id=0,
+                level=0,
+            )
+            for p in level
+            for i in range(width)
+        )
+    Category._tree_manager.rebuild()
+
+
+def descendant_ids_in_python(slug):
+    children = {}
+    for pk, parent_id in Category.objects.values_list("pk", "parent_id"):
+        children.setdefault(parent_id, []).append(pk)
+    stack = [Category.objects.get(slug=slug).pk]
+    found = []
+    while stack:
+        pk = stack.pop()
+        found.append(pk)
+        stack.extend(children.get(pk, ()))
+    return found
+
+
+def test_subtree_range_vs_python_descendants(
+    scale, best_of, report, product_type_factory
+):
+    width = max(2, int(4 * scale))
+    build_tree(depth=6, width=width)
+    categories = list(Category.objects.values_list("pk", flat=True))
+    product_type = product_type_factory()
+    Product.objects.bulk_create(
+        Product(
+            name=f"p_{i}",
+            slug=f"p_{i}",
+            pid=f"{i}",
+            description="",
+            category_id=categories[i % len(categories)],
+            product_type=product_type,
+            is_active=True,
+        )
+        for i in range(len(categories) * 3)
+    )
+    # A mid-level node with a wide subtree.
+    slug = Category.objects.filter(level=2).values_list("slug", flat=True).first()
+
+    def by_range():
+        category = Category.objects.get(slug=slug)
+        return list(
+            Product.objects.is_active()
+            .in_category_tree(category)
+            .values_list("pk", flat=True)
+        )
+
+    def by_python():
+        ids = descendant_ids_in_python(slug)
+        return list(
+            Product.objects.is_active()
+            .filter(category_id__in=ids)
+            .values_list("pk", flat=True)
+        )
+
+    with CaptureQueriesContext(connection) as ctx:
+        found = by_range()
+    assert len(ctx.captured_queries) == 2
+    assert sorted(found) == sorted(by_python())
+
+    report(
+        "category subtree",
+        categories=len(categories),
+        products=len(categories) * 3,
+        matched=len(found),
+        range=best_of(by_range),
+        python=best_of(by_python),
+    )
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, connections
+from django.test import RequestFactory
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db(transaction=True)]
+
+
+def serve(handler, paths):
+    """
+    Serve requests the way a WSGI server thread does, so request_started and
+    request_finished close or keep the thread's connection per CONN_MAX_AGE.
+    """
+    factory = RequestFactory()
+    try:
+        for path in paths:
+            response = handler(factory.get(path).environ, lambda *args: None)
+            b"".join(response)
+            response.close()
+    finally:
+        connections.close_all()
+
+
+def requests_per_second(handler, threads, requests):
+    # A distinct query string per request misses the response cache, so every
+    # request reaches the database.
+    batches = [
+        [f"/api/product/?n={thread}-{n}" for n in range(requests)]
+        for thread in range(threads)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda paths: serve(handler, paths), batches))
+    return int(threads * requests / (time.perf_counter() - start))
+
+
+def test_persistent_vs_per_request_connections(
+    scale, report, product_factory, product_line_factory, request
+):
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        # In-memory SQLite never closes connections.
+        request.getfixturevalue("file_database")
+    for product in product_factory.create_batch(20):
+        product_line_factory(product=product)
+    handler = WSGIHandler()
+    # Build the stored documents once.
+    serve(handler, ["/api/product/"])
+
+    threads = 8
+    requests = int(50 * scale)
+    settings_dict = connections.settings["default"]
+    original = settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"]
+    results = {}
+    try:
+        for name, max_age, health_checks in [
+            ("per_request", 0, False),
+            ("persistent", 60, False),
+            ("persistent_checked", 60, True),
+        ]:
+            # Connections opened by the worker threads read the new values.
+            settings_dict["CONN_MAX_AGE"] = max_age
+            settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+            results[name] = requests_per_second(handler, threads, requests)
+    finally:
+        settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"] = original
+
+    report(
+        "requests per second",
+        threads=threads,
+        requests=threads * requests,
+        engine=connection.vendor,
+        **results,
+    )
@@ -0,0 +1,114 @@
+import pytest
+from django.db.models import Count
+
+from ...product.facets import facet_counts, filter_products, index_products
+from ...product.models import (
+    AttributeValue,
+    Product,
+    ProductLine,
+    ProductLineAttributeValue,
+)
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+def build_catalog(size, attributes, product_type, category):
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"p_{i}",
+            slug=f"p_{i}",
+            pid=f"{i}",
+            description="",
+            category=category,
+            product_type=product_type,
+            is_active=True,
+        )
+        for i in range(size)
+    )
+    lines = ProductLine.objects.bulk_create(
+        ProductLine(
+            price=10,
+            sku=f"sku_{product.pk}_{n}",
+            stock_qty=1,
+            is_active=True,
+            product=product,
+            product_type=product_type,
+            order=n,
+            weight=1,
+        )
+        for product in products
+        for n in range(2)
+    )
+    ProductLineAttributeValue.objects.bulk_create(
+        ProductLineAttributeValue(
+            product_line=line, attribute_value=values[(i + a) % len(values)]
+        )
+        for i, line in enumerate(lines)
+        for a, values in enumerate(attributes)
+    )
+    index_products(product.pk for product in products)
+
+
+def test_facet_index_vs_attribute_joins(
+    scale,
+    best_of,
+    report,
+    attribute_factory,
+    category_factory,
+    product_type_factory,
+):
+    attributes = [
+        [
+            AttributeValue.objects.create(attribute=attribute, attribute_value=f"v{n}")
+            for n in range(5)
+        ]
+        for attribute in attribute_factory.create_batch(3)
+    ]
+    build_catalog(
+        int(5000 * scale), attributes, product_type_factory(), category_factory()
+    )
+    wanted = [values[0] for values in attributes[:2]]
+    listing = Product.objects.is_active()
+
+    def by_joins():
+        # One join chain per attribute, the same line across the chains.
+        queryset = listing.filter(
+            product_line__is_active=True,
+            product_line__attribute_value=wanted[0],
+        ).filter(
+            product_line__attribute_value=wanted[1],
+            product_line__pk__in=ProductLine.objects.filter(
+                attribute_value=wanted[0]
+            ).values("pk"),
+        )
+        return set(queryset.values_list("pk", flat=True))
+
+    def by_index():
+        filters = {value.attribute_id: {value.attribute_value} for value in wanted}
+        return set(filter_products(listing, filters).values_list("pk", flat=True))
+
+    def facets_by_joins():
+        return list(
+            ProductLineAttributeValue.objects.filter(
+                product_line__product__in=listing, product_line__is_active=True
+            )
+            .values_list(
+                "attribute_value__attribute", "attribute_value__attribute_value"
+            )
+            .annotate(count=Count("product_line__product", distinct=True))
+        )
+
+    assert by_index() == by_joins()
+    assert len(facets_by_joins()) == sum(map(len, facet_counts(listing).values()))
+    report(
+        "attribute filter",
+        products=listing.count(),
+        joins=best_of(by_joins),
+        index=best_of(by_index),
+    )
+    report(
+        "facet counts",
+        products=listing.count(),
+        joins=best_of(facets_by_joins),
+        index=best_of(lambda: facet_counts(listing)),
+    )
@@ -0,0 +1,47 @@
+import datetime
+import decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from ...product import renderers
+from ...product.renderers import CatalogJSONRenderer
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(renderers.orjson is None, reason="orjson is not installed"),
+]
+
+
+def page(count):
+    created = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.UTC)
+    return {
+        "next": "http://testserver/api/product/?cursor=abc",
+        "previous": None,
+        "results": [
+            {
+                "name": f"product {n}",
+                "slug": f"product-{n}",
+                "price": decimal.Decimal(f"{n % 1000}.{n % 100:02d}"),
+                "created_at": created + datetime.timedelta(seconds=n),
+                "specification": {1: "red", 2: "M"},
+                "product_image": [{"url": f"/images/{n}.jpg", "order": 1}],
+            }
+            for n in range(count)
+        ],
+    }
+
+
+@pytest.mark.parametrize("count", [100, 10_000])
+def test_catalog_vs_json_renderer(count, scale, best_of, report):
+    data = page(int(count * scale))
+    catalog = CatalogJSONRenderer()
+
+    assert catalog.render(data) == JSONRenderer().render(data)
+
+    report(
+        "json renderer",
+        items=len(data["results"]),
+        json=best_of(lambda: JSONRenderer().render(data)),
+        orjson=best_of(lambda: catalog.render(data)),
+    )
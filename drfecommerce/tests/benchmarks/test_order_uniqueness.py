@@ -0,0 +1,53 @@
+import pytest
+
+from ...product.models import ProductImage
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+def test_image_save_latency_flat_in_sibling_count(
+    scale, best_of, report, product_line_factory, django_capture_on_commit_callbacks
+):
+    line = product_line_factory()
+    sizes = [10, int(1000 * scale), int(5000 * scale)]
+    timings = {}
+    committed = {}
+
+    existing = 0
+    for size in sizes:
+        ProductImage.objects.bulk_create(
+            ProductImage(product_line=line, alternative_text="x", order=order)
+            for order in range(existing + 1, size + 1)
+        )
+        existing = size
+
+        image = ProductImage(product_line=line, alternative_text="probe")
+
+        def save():
+            image.pk = None
+            image.order = size + 1
+            image.save()
+            ProductImage.objects.filter(pk=image.pk).delete()
+
+        def save_and_commit():
+            with django_capture_on_commit_callbacks(execute=True):
+                save()
+
+        # The test transaction never commits, so save() is timed as it runs
+        # inside a transaction: validation and the insert, with the product
+        # document rebuild deferred to the commit.
+        timings[size] = best_of(save, repeat=20)
+        # The commit then rebuilds the document once, which serializes every
+        # image of the product and so grows with the sibling count.
+        committed[size] = best_of(save_and_commit, repeat=5)
+
+    report(
+        "image save vs siblings",
+        **{f"siblings_{size}": timing for size, timing in timings.items()},
+    )
+    report(
+        "image save and commit vs siblings",
+        **{f"siblings_{size}": timing for size, timing in committed.items()},
+    )
+    # An O(n) sibling scan grows roughly 500x between the first and last size.
+    assert timings[sizes[-1]] < timings[sizes[0]] * 5
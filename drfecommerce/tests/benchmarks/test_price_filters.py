@@ -0,0 +1,78 @@
+import random
+
+import pytest
+from django.db.models import Max, Min, Q, Sum
+
+from ...product.filters import filter_listing
+from ...product.models import Product, ProductLine
+from ...product.summaries import refresh_summaries
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+def test_summary_columns_vs_group_by(
+    scale, best_of, report, category_factory, product_type_factory
+):
+    rng = random.Random(0)
+    category = category_factory()
+    product_type = product_type_factory()
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"p_{i}",
+            slug=f"p_{i}",
+            pid=f"{i}",
+            description="",
+            category=category,
+            product_type=product_type,
+            is_active=True,
+        )
+        for i in range(int(20000 * scale))
+    )
+    ProductLine.objects.bulk_create(
+        (
+            ProductLine(
+                price=rng.randint(1, 500),
+                sku=f"sku_{product.pk}_{n}",
+                stock_qty=rng.choice([0, 0, 1, 5]),
+                is_active=True,
+                product=product,
+                product_type=product_type,
+                order=n,
+                weight=1,
+            )
+            for product in products
+            for n in range(3)
+        ),
+        batch_size=1000,
+    )
+    refresh_summaries(product.pk for product in products)
+    filters = {"price_min": 50, "price_max": 100, "in_stock": True, "by_price": True}
+
+    def group_by():
+        active = Q(product_line__is_active=True)
+        return list(
+            Product.objects.is_active()
+            .annotate(
+                low=Min("product_line__price", filter=active),
+                high=Max("product_line__price", filter=active),
+                stock=Sum("product_line__stock_qty", filter=active),
+            )
+            .filter(high__gte=50, low__lte=100, stock__gt=0)
+            .order_by("low", "id")
+            .values_list("pk", flat=True)[:20]
+        )
+
+    def summary():
+        return list(
+            filter_listing(Product.objects.is_active(), filters)
+            .order_by("min_price", "id")
+            .values_list("pk", flat=True)[:20]
+        )
+
+    assert summary() == group_by()
+    report(
+        "in stock, price 50-100, by price",
+        products=len(products),
+        group_by=best_of(group_by),
+        summary=best_of(summary),
+    )
@@ -0,0 +1,103 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from ...product.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductImage,
+    ProductLine,
+    ProductLineAttributeValue,
+    ProductType,
+)
+from ...product.serializers import ProductSerializer, serialize_product
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+def build_catalog(count):
+    """
+    `count` products with two lines each, two images and two attribute values
+    per line, written with bulk_create().
+    """
+    attributes = Attribute.objects.bulk_create(
+        Attribute(name=name, description="") for name in ("color", "size")
+    )
+    product_type = ProductType.objects.create(name="type")
+    product_type.attribute.set(attributes)
+    values = AttributeValue.objects.bulk_create(
+        AttributeValue(attribute=attribute, attribute_value=f"{attribute.name}{n}")
+        for attribute in attributes
+        for n in range(4)
+    )
+    category = Category.objects.create(name="category", slug="category")
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"product {n}",
+            slug=f"product-{n}",
+            pid=f"{n}",
+            description="A product description.",
+            category=category,
+            product_type=product_type,
+            is_active=True,
+        )
+        for n in range(count)
+    )
+    lines = ProductLine.objects.bulk_create(
+        ProductLine(
+            price=f"{n % 1000}.{n % 100:02d}",
+            sku=f"sku-{n}",
+            stock_qty=n % 50,
+            is_active=True,
+            product=products[n // 2],
+            product_type=product_type,
+            order=n % 2 + 1,
+            weight=1.5,
+        )
+        for n in range(count * 2)
+    )
+    ProductImage.objects.bulk_create(
+        ProductImage(
+            url=f"images/{line.sku}-{n}.jpg",
+            alternative_text=line.sku,
+            product_line=line,
+            order=n,
+        )
+        for line in lines
+        for n in (1, 2)
+    )
+    ProductLineAttributeValue.objects.bulk_create(
+        ProductLineAttributeValue(
+            product_line=line, attribute_value=values[n * 4 + i % 4]
+        )
+        for i, line in enumerate(lines)
+        for n in (0, 1)
+    )
+
+
+@pytest.mark.parametrize("count", [1, 100, 10_000])
+def test_fast_path_vs_product_serializer(count, best_of, report):
+    build_catalog(count)
+    # Serialization only: the related rows are loaded up front.
+    products = list(Product.objects.for_api())
+    renderer = JSONRenderer()
+
+    def drf():
+        return ProductSerializer(products, many=True).data
+
+    def fast():
+        return [serialize_product(product) for product in products]
+
+    assert renderer.render(fast()) == renderer.render(drf())
+
+    repeat = 5 if count < 10_000 else 2
+    drf_time = best_of(drf, repeat=repeat)
+    fast_time = best_of(fast, repeat=repeat)
+    report(
+        "product serializer",
+        products=count,
+        drf=drf_time,
+        fast=fast_time,
+        speedup=f"{drf_time / fast_time:.1f}x",
+    )
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+from django.db.models import Case, Q, When
+
+from ...product.models import Product
+from ...product.search import index_products, search_products
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+WORDS = [
+    f"{stem}{n}" for stem in ("alpha", "bravo", "delta", "kilo") for n in range(500)
+]
+# Words most products contain, one short enough for the prefix index.
+COMMON = ["blue", "cotton"]
+
+
+def build_catalog(size, categories, product_type):
+    rng = random.Random(0)
+    products = Product.objects.bulk_create(
+        (
+            Product(
+                name=" ".join(rng.choices(WORDS, k=3)),
+                slug=f"p_{i}",
+                pid=f"{i}",
+                description=" ".join(
+                    rng.choices(WORDS, k=20)
+                    + [word for word in COMMON if rng.random() < 0.9]
+                ),
+                category=categories[i % len(categories)],
+                product_type=product_type,
+                is_active=True,
+            )
+            for i in range(size)
+        ),
+        batch_size=1000,
+    )
+    pks = [product.pk for product in products]
+    for start in range(0, len(pks), 5000):
+        index_products(pks[start : start + 5000])
+
+
+def scan(query, limit):
+    # Substring matching over the source columns, ranking name matches first,
+    # with no index to use.
+    condition = Q()
+    for word in query.split():
+        condition &= (
+            Q(name__icontains=word)
+            | Q(description__icontains=word)
+            | Q(category__name__icontains=word)
+        )
+    in_name = Case(When(name__icontains=query.split()[-1], then=1), default=0)
+    return list(
+        Product.objects.is_active()
+        .filter(condition)
+        .order_by(in_name.desc(), "-pk")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def test_search_latency(scale, best_of, report, category_factory, product_type_factory):
+    size = int(100_000 * scale)
+    build_catalog(size, category_factory.create_batch(20), product_type_factory())
+
+    queries = {
+        "word": "delta42",
+        "prefix": "kilo4",
+        "one letter": "k",
+        "common word": "blue",
+        "common long word": "cotton",
+        "two words": "alpha1 bravo2",
+        "three words": "alpha1 bravo2 kil",
+        "no match": "zulu",
+    }
+    for name, query in queries.items():
+        assert search_products(query, 20) or name == "no match"
+        report(
+            f"search {name!r}",
+            products=size,
+            index=best_of(lambda: search_products(query, 20)),
+            scan=best_of(lambda: scan(query, 20), repeat=1),
+        )
@@ -1,3 +1,6 @@
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
 from pytest_factoryboy import register
 from rest_framework.test import APIClient
 import pytest
@@ -25,3 +28,60 @@ register(ProductLineAttributeValueFactory)
 @pytest.fixture
 def api_client():
     return APIClient
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    """
+    Point the default database at a migrated SQLite file in tmp_path for the
+    test, for behaviour the in-memory test database does not show: whole-file
+    locking, and connections that are really closed and reopened.
+    """
+    original = connections.settings[DEFAULT_DB_ALIAS]
+    memory = connections[DEFAULT_DB_ALIAS]
+    connections.settings[DEFAULT_DB_ALIAS] = {
+        **original,
+        "NAME": str(tmp_path / "db.sqlite3"),
+    }
+    # Threads connect from the settings, this thread through the new wrapper.
+    connections[DEFAULT_DB_ALIAS] = connections.create_connection(DEFAULT_DB_ALIAS)
+    try:
+        call_command("migrate", verbosity=0)
+        yield
+    finally:
+        connections[DEFAULT_DB_ALIAS].close()
+        connections.settings[DEFAULT_DB_ALIAS] = original
+        connections[DEFAULT_DB_ALIAS] = memory
+
+
+@pytest.fixture
+def catalog_size():
+    return 5
+
+
+@pytest.fixture
+def catalog(
+    catalog_size,
+    category_factory,
+    product_factory,
+    product_line_factory,
+    product_image_factory,
+    attribute_value_factory,
+):
+    """
+    `catalog_size` products of one category, each with two lines carrying two
+    images and an attribute value. Override `catalog_size` for another count.
+    """
+    category = category_factory()
+    products = product_factory.create_batch(catalog_size, category=category)
+    for product in products:
+        for line in product_line_factory.create_batch(2, product=product):
+            product_image_factory.create_batch(2, product_line=line)
+            line.attribute_value.add(attribute_value_factory())
+    return products
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestAsyncEndpoints:
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "category/",
+            "product/",
+            "product/?page_size=2",
+            "product/?fields=name,product_line.price&page_size=2",
+            "product/?fields=slug&facets=true",
+        ],
+    )
+    def test_matches_sync_endpoint(self, path, catalog, api_client):
+        client = api_client()
+        sync = client.get(f"/api/{path}")
+        response = client.get(f"/api/async/{path}")
+
+        assert response.status_code == 200
+        # Pagination links point back at the endpoint that served the page.
+        assert response.content.replace(b"/api/async/", b"/api/") == sync.content
+        assert response["ETag"] == sync["ETag"]
+
+    @pytest.mark.parametrize("query", ["", "?fields=name&expand=product_line"])
+    def test_retrieve_matches_sync_endpoint(self, query, catalog, api_client):
+        client = api_client()
+        url = f"product/{catalog[0].slug}/{query}"
+
+        sync = client.get(f"/api/{url}")
+        response = client.get(f"/api/async/{url}")
+
+        assert response.content == sync.content
+        assert response["ETag"] == sync["ETag"]
+
+    def test_list_pages_with_cursor(self, catalog, api_client):
+        client = api_client()
+        first = json.loads(client.get("/api/async/product/?page_size=3").content)
+        second = json.loads(client.get(first["next"]).content)
+
+        slugs = [p["slug"] for p in first["results"] + second["results"]]
+        assert sorted(slugs) == sorted(p.slug for p in catalog)
+
+    def test_list_single_query(self, catalog, api_client, django_assert_num_queries):
+        client = api_client()
+        client.get("/api/async/product/")
+
+        with django_assert_num_queries(1):
+            client.get("/api/async/product/")
+
+    def test_not_modified(self, catalog, api_client):
+        client = api_client()
+        etag = client.get("/api/async/product/")["ETag"]
+
+        response = client.get("/api/async/product/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize("query", ["fields=bogus", "expand=name"])
+    def test_invalid_fieldset(self, query, catalog, api_client):
+        client = api_client()
+
+        for url in ["product/", f"product/{catalog[0].slug}/"]:
+            sync = client.get(f"/api/{url}?{query}")
+            response = client.get(f"/api/async/{url}?{query}")
+
+            assert response.status_code == sync.status_code == 400
+            assert json.loads(response.content) == json.loads(sync.content)
+
+    def test_invalid_cursor(self, catalog, api_client):
+        response = api_client().get("/api/async/product/?cursor=bogus")
+
+        assert response.status_code == 404
+
+    def test_read_only(self, api_client):
+        assert api_client().post("/api/async/product/").status_code == 405
+
+    def test_served_by_asgi_handler(self, catalog):
+        response = async_to_sync(AsyncClient().get)("/api/async/product/")
+
+        assert response.status_code == 200
+        assert len(json.loads(response.content)["results"]) == len(catalog)
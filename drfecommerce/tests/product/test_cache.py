@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from django.db import transaction
+
+from ...product.cache import catalog_cache, group_versions, invalidate
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestResponseCache:
+    endpoint = "/api/product/"
+
+    def test_repeat_request_served_from_cache(
+        self, product_factory, api_client, django_assert_num_queries
+    ):
+        product_factory.create_batch(3)
+        client = api_client()
+        first = client.get(self.endpoint)
+
+        with django_assert_num_queries(0):
+            second = client.get(self.endpoint)
+
+        assert second.content == first.content
+
+    def test_query_params_are_part_of_the_key(self, product_factory, api_client):
+        product_factory.create_batch(3)
+        client = api_client()
+
+        full = json.loads(client.get(self.endpoint).content)
+        page = json.loads(client.get(f"{self.endpoint}?page_size=1").content)
+
+        assert len(full["results"]) == 3
+        assert len(page["results"]) == 1
+
+    def test_eviction_waits_for_commit(self):
+        cache = catalog_cache()
+        before = group_versions(cache, ["products", "categories"])
+
+        with transaction.atomic():
+            invalidate("products", "categories")
+            assert group_versions(cache, ["products", "categories"]) == before
+
+        after = group_versions(cache, ["products", "categories"])
+        assert all(old != new for old, new in zip(before, after))
+
+    def test_line_change_evicts_only_affected_listings(
+        self,
+        category_factory,
+        product_factory,
+        product_line_factory,
+        api_client,
+        django_assert_num_queries,
+    ):
+        cat_1 = category_factory(slug="cat1")
+        cat_2 = category_factory(slug="cat2")
+        product = product_factory(category=cat_1, slug="changed")
+        product_factory(category=cat_2, slug="untouched")
+        line = product_line_factory(product=product, price="10.00")
+        client = api_client()
+        urls = [
+            f"{self.endpoint}changed/",
+            f"{self.endpoint}untouched/",
+            f"{self.endpoint}category/cat1/all/",
+            f"{self.endpoint}category/cat2/all/",
+        ]
+        for url in urls:
+            client.get(url)
+
+        line.price = "12.50"
+        line.save()
+
+        with django_assert_num_queries(0):
+            client.get(f"{self.endpoint}untouched/")
+            client.get(f"{self.endpoint}category/cat2/all/")
+        detail = json.loads(client.get(f"{self.endpoint}changed/").content)
+        listing = json.loads(client.get(f"{self.endpoint}category/cat1/all/").content)
+
+        assert detail[0]["product_line"][0]["price"] == "12.50"
+        assert listing["results"][0]["product_line"][0]["price"] == "12.50"
+
+    def test_moving_product_evicts_old_category(
+        self, category_factory, product_factory, api_client
+    ):
+        cat_1 = category_factory(slug="cat1")
+        cat_2 = category_factory(slug="cat2")
+        product = product_factory(category=cat_1)
+        client = api_client()
+        client.get(f"{self.endpoint}category/cat1/all/")
+
+        product.category = cat_2
+        product.save()
+
+        listing = json.loads(client.get(f"{self.endpoint}category/cat1/all/").content)
+        assert listing["results"] == []
+
+    def test_product_change_evicts_ancestor_subtree_listing(
+        self, category_factory, product_factory, api_client
+    ):
+        root = category_factory(slug="root")
+        child = category_factory(slug="child", parent=root)
+        client = api_client()
+        url = f"{self.endpoint}category/root/all/?subtree=true"
+        client.get(url)
+
+        product_factory(category=child)
+
+        assert len(json.loads(client.get(url).content)["results"]) == 1
+
+    def test_new_category_evicts_category_list(self, category_factory, api_client):
+        client = api_client()
+        category_factory()
+        client.get("/api/category/")
+
+        category_factory()
+
+        assert len(json.loads(client.get("/api/category/").content)) == 2
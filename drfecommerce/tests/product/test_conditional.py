@@ -0,0 +1,84 @@
+import pytest
+from django.core.cache import caches
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestConditionalGet:
+    endpoint = "/api/product/"
+
+    def test_retrieve_not_modified(self, product_factory, api_client):
+        product_factory(slug="test")
+        client = api_client()
+        etag = client.get(f"{self.endpoint}test/")["ETag"]
+        caches["catalog"].clear()
+
+        response = client.get(f"{self.endpoint}test/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_retrieve_not_modified_from_cache(
+        self, product_factory, api_client, django_assert_num_queries
+    ):
+        product_factory(slug="test")
+        client = api_client()
+        etag = client.get(f"{self.endpoint}test/")["ETag"]
+
+        with django_assert_num_queries(0):
+            response = client.get(f"{self.endpoint}test/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_retrieve_modified_after_line_change(
+        self, product_factory, product_line_factory, api_client
+    ):
+        product = product_factory(slug="test")
+        client = api_client()
+        etag = client.get(f"{self.endpoint}test/")["ETag"]
+
+        product_line_factory(product=product)
+        response = client.get(f"{self.endpoint}test/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_list_if_modified_since(self, product_factory, api_client):
+        product_factory.create_batch(2)
+        client = api_client()
+        last_modified = client.get(self.endpoint)["Last-Modified"]
+        caches["catalog"].clear()
+
+        response = client.get(self.endpoint, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    def test_list_pages_have_distinct_etags(self, product_factory, api_client):
+        product_factory.create_batch(3)
+        client = api_client()
+
+        first = client.get(f"{self.endpoint}?page_size=1")["ETag"]
+        second = client.get(f"{self.endpoint}?page_size=2")["ETag"]
+
+        assert first != second
+
+    def test_list_modified_when_product_deactivated(self, product_factory, api_client):
+        products = product_factory.create_batch(2)
+        client = api_client()
+        etag = client.get(self.endpoint)["ETag"]
+
+        products[0].is_active = False
+        products[0].save()
+        response = client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_category_list_not_modified(self, category_factory, api_client):
+        category_factory.create_batch(3)
+        client = api_client()
+        etag = client.get("/api/category/")["ETag"]
+        caches["catalog"].clear()
+
+        response = client.get("/api/category/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from django.db import transaction
+
+from ...product.documents import render_product_document
+from ...product.models import Product, ProductDocument
+from ...product.signals import catalog_changed
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestProductDocument:
+    endpoint = "/api/product/"
+
+    def get_document(self, product):
+        return json.loads(ProductDocument.objects.get(product=product).document)
+
+    def test_document_built_on_save(self, product_factory):
+        product = product_factory(name="first")
+        assert self.get_document(product)["name"] == "first"
+
+        product.name = "second"
+        product.save()
+        assert self.get_document(product)["name"] == "second"
+
+    def test_document_rebuilt_on_nested_changes(
+        self,
+        product_factory,
+        product_line_factory,
+        product_image_factory,
+        attribute_value_factory,
+    ):
+        product = product_factory()
+        line = product_line_factory(product=product, sku="sku-1")
+        product_image_factory(product_line=line, alternative_text="front")
+        value = attribute_value_factory(attribute_value="red")
+        line.attribute_value.add(value)
+
+        document = self.get_document(product)
+        (line_doc,) = document["product_line"]
+        assert line_doc["sku"] == "sku-1"
+        assert line_doc["product_image"][0]["alternative_text"] == "front"
+        assert line_doc["specification"] == {str(value.attribute_id): "red"}
+
+        value.attribute_value = "blue"
+        value.save()
+        line_doc = self.get_document(product)["product_line"][0]
+        assert line_doc["specification"] == {str(value.attribute_id): "blue"}
+
+    def test_document_matches_serializer(self, product_line_factory):
+        line = product_line_factory()
+        product = Product.objects.for_api().get(pk=line.product_id)
+        stored = ProductDocument.objects.get(product=product).document
+        assert stored == render_product_document(product)
+
+    def test_missing_document_built_on_read(self, product_factory, api_client):
+        product = product_factory(slug="lazy")
+        ProductDocument.objects.all().delete()
+
+        response = api_client().get(f"{self.endpoint}{product.slug}/")
+
+        assert json.loads(response.content)[0]["slug"] == "lazy"
+        assert ProductDocument.objects.filter(product=product).exists()
+
+    def test_changes_in_a_transaction_rebuild_once(
+        self, product_factory, product_line_factory, product_image_factory
+    ):
+        product = product_factory()
+        sent = []
+
+        def record(sender, product_ids, **kwargs):
+            sent.append(product_ids)
+
+        catalog_changed.connect(record)
+        try:
+            with transaction.atomic():
+                lines = product_line_factory.create_batch(2, product=product)
+                product_image_factory.create_batch(3, product_line=lines[0])
+                assert sent == []
+        finally:
+            catalog_changed.disconnect(record)
+
+        assert sent == [{product.pk}]
+        (first, _) = self.get_document(product)["product_line"]
+        assert len(first["product_image"]) == 3
+
+    def test_rolled_back_changes_are_not_sent(self, product_factory):
+        product = product_factory(name="kept")
+        with pytest.raises(RuntimeError), transaction.atomic():
+            product.name = "discarded"
+            product.save()
+            raise RuntimeError
+
+        assert self.get_document(product)["name"] == "kept"
@@ -1,7 +1,11 @@
 import pytest
 import json
 
-pytestmark = pytest.mark.django_db
+from django.utils import timezone
+
+from ...product.models import Category
+
+pytestmark = pytest.mark.django_db(transaction=True)
 
 
 class TestCategoryEndpoints:
@@ -16,17 +20,87 @@ class TestCategoryEndpoints:
         assert response.status_code == 200
         assert len(json.loads(response.content)) == 10
 
+    def test_list_query_budget(
+        self, category_factory, api_client, django_assert_max_num_queries
+    ):
+        category_factory.create_batch(10)
+        # Conditional GET validators and the category rows.
+        with django_assert_max_num_queries(2):
+            api_client().get(self.endpoint)
+
+    def test_tree(self, category_factory, api_client, django_assert_num_queries):
+        root = category_factory(name="root", slug="root")
+        child = category_factory(name="child", slug="child", parent=root)
+        category_factory(name="leaf", slug="leaf", parent=child)
+        category_factory(name="hidden", slug="hidden", parent=root, is_active=False)
+        client = api_client()
+
+        # The tree version, then the categories; only the version once built.
+        with django_assert_num_queries(2):
+            response = client.get(f"{self.endpoint}tree/")
+        with django_assert_num_queries(1):
+            client.get(f"{self.endpoint}tree/")
+
+        assert json.loads(response.content) == [
+            {
+                "category_name": "root",
+                "slug": "root",
+                "children": [
+                    {
+                        "category_name": "child",
+                        "slug": "child",
+                        "children": [
+                            {"category_name": "leaf", "slug": "leaf", "children": []}
+                        ],
+                    }
+                ],
+            }
+        ]
+
+    def test_tree_rebuilt_after_category_change(self, category_factory, api_client):
+        root = category_factory(name="root")
+        client = api_client()
+        client.get(f"{self.endpoint}tree/")
+
+        root.name = "renamed"
+        root.save()
+        response = client.get(f"{self.endpoint}tree/")
+
+        assert json.loads(response.content)[0]["category_name"] == "renamed"
+
+    def test_tree_follows_changes_made_elsewhere(self, category_factory, api_client):
+        category_factory(name="root", slug="root")
+        category_factory(name="gone", slug="gone")
+        client = api_client()
+        client.get(f"{self.endpoint}tree/")
+
+        # As another process would, with no signal reaching this one.
+        Category.objects.filter(slug="root").update(
+            name="renamed", updated_at=timezone.now()
+        )
+        response = client.get(f"{self.endpoint}tree/")
+        names = {c["category_name"] for c in json.loads(response.content)}
+        assert names == {"renamed", "gone"}
+
+        Category.objects.filter(slug="gone").delete()
+        response = client.get(f"{self.endpoint}tree/")
+        assert len(json.loads(response.content)) == 1
+
 
 class TestProductEndpoints:
     endpoint = "/api/product/"
 
+    # Conditional GET validators, then the products with their stored
+    # documents in a single query.
+    query_budget = 2
+
     def test_list_all(self, product_factory, api_client):
 
         product_factory.create_batch(10)
 
         response = api_client().get(self.endpoint)
         assert response.status_code == 200
-        assert len(json.loads(response.content)) == 10
+        assert len(json.loads(response.content)["results"]) == 10
 
     def test_get_one_by_slug(self, product_factory, api_client):
         obj = product_factory(slug="test")
@@ -43,4 +117,75 @@ class TestProductEndpoints:
 
         response = api_client().get(f"{self.endpoint}category/{cat_1.slug}/all/")
         assert response.status_code == 200
-        assert len(json.loads(response.content)) == 1
+        assert len(json.loads(response.content)["results"]) == 1
+
+    def test_get_by_category_subtree(
+        self, product_factory, category_factory, api_client
+    ):
+        root = category_factory(slug="root")
+        child = category_factory(slug="child", parent=root)
+        grandchild = category_factory(slug="grandchild", parent=child)
+        sibling = category_factory(slug="sibling")
+        for category in (root, child, grandchild, sibling):
+            product_factory(category=category)
+        client = api_client()
+
+        exact = client.get(f"{self.endpoint}category/child/all/")
+        subtree = client.get(f"{self.endpoint}category/root/all/?subtree=true")
+
+        assert len(json.loads(exact.content)["results"]) == 1
+        assert len(json.loads(subtree.content)["results"]) == 3
+
+    def test_list_follows_cursor_through_all_pages(self, product_factory, api_client):
+        products = product_factory.create_batch(7)
+        client = api_client()
+
+        seen = []
+        url = f"{self.endpoint}?page_size=3"
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            data = json.loads(response.content)
+            assert len(data["results"]) <= 3
+            seen.extend(item["slug"] for item in data["results"])
+            url = data["next"]
+
+        assert seen == [p.slug for p in reversed(products)]
+
+    def test_list_previous_cursor_returns_prior_page(self, product_factory, api_client):
+        product_factory.create_batch(5)
+        client = api_client()
+
+        first = json.loads(client.get(f"{self.endpoint}?page_size=2").content)
+        second = json.loads(client.get(first["next"]).content)
+        back = json.loads(client.get(second["previous"]).content)
+
+        assert first["previous"] is None
+        assert back["results"] == first["results"]
+
+    def test_list_invalid_cursor(self, api_client):
+        response = api_client().get(f"{self.endpoint}?cursor=not-a-cursor")
+        assert response.status_code == 404
+
+    def test_list_query_budget(
+        self, catalog, api_client, django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(self.query_budget):
+            response = api_client().get(self.endpoint)
+        assert len(json.loads(response.content)["results"]) == len(catalog)
+
+    def test_get_one_by_slug_query_budget(
+        self, catalog, api_client, django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(self.query_budget):
+            response = api_client().get(f"{self.endpoint}{catalog[0].slug}/")
+        assert response.status_code == 200
+
+    def test_get_by_category_slug_query_budget(
+        self, catalog, api_client, django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(self.query_budget):
+            response = api_client().get(
+                f"{self.endpoint}category/{catalog[0].category.slug}/all/"
+            )
+        assert len(json.loads(response.content)["results"]) == len(catalog)
@@ -0,0 +1,86 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...product.export import ndjson_chunks
+from ...product.models import Product, ProductDocument
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog(product_factory, product_line_factory):
+    products = product_factory.create_batch(5)
+    for product in products:
+        product_line_factory(product=product)
+    product_factory(is_active=False)
+    return products
+
+
+def read_lines(content):
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class TestExport:
+    endpoint = "/api/product/export/"
+
+    def test_streams_active_products(self, catalog, api_client):
+        response = api_client().get(self.endpoint)
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = read_lines(b"".join(response.streaming_content))
+        assert [line["slug"] for line in lines] == [p.slug for p in catalog]
+
+    def test_lines_are_stored_documents(self, catalog, api_client):
+        content = b"".join(api_client().get(self.endpoint).streaming_content)
+
+        documents = ProductDocument.objects.filter(product__is_active=True).order_by(
+            "product_id"
+        )
+        assert content.decode() == "".join(f"{d.document}\n" for d in documents)
+
+    def test_chunks_build_missing_documents(self, catalog):
+        def first_chunk(chunk_size):
+            ProductDocument.objects.all().delete()
+            chunks = ndjson_chunks(Product.objects.is_active(), chunk_size)
+            with CaptureQueriesContext(connection) as ctx:
+                chunk = next(chunks)
+            return chunk, len(ctx.captured_queries)
+
+        small, small_queries = first_chunk(2)
+        large, large_queries = first_chunk(4)
+
+        assert (small.count("\n"), large.count("\n")) == (2, 4)
+        # One set of prefetches per chunk, however many products it holds.
+        assert small_queries == large_queries
+
+    def test_query_count_independent_of_catalog_size(
+        self, catalog, product_factory, django_assert_num_queries
+    ):
+        product_factory.create_batch(20)
+        list(ndjson_chunks(Product.objects.all()))
+
+        with django_assert_num_queries(1):
+            list(ndjson_chunks(Product.objects.all(), chunk_size=10))
+
+    def test_command_writes_stdout(self, catalog):
+        out = io.StringIO()
+
+        call_command("export_catalog", chunk_size=2, stdout=out)
+
+        assert len(read_lines(out.getvalue())) == len(catalog)
+
+    def test_command_writes_file(self, catalog, tmp_path):
+        path = tmp_path / "catalog.ndjson"
+        out = io.StringIO()
+
+        call_command("export_catalog", str(path), stdout=out)
+
+        assert len(read_lines(path.read_text())) == len(catalog)
+        assert "exported 5 products" in out.getvalue()
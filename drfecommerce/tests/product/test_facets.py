@@ -0,0 +1,192 @@
+import json
+
+import pytest
+from django.http import QueryDict
+from rest_framework.exceptions import ValidationError
+
+from ...product.facets import parse_attr_filters
+from ...product.models import Product, ProductLineFacet
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestParseAttrFilters:
+    def test_groups_values_by_attribute(self):
+        query = QueryDict("attr=1:red&attr=1:blue&attr=2:XL:tall")
+
+        assert parse_attr_filters(query) == {1: {"red", "blue"}, 2: {"XL:tall"}}
+
+    @pytest.mark.parametrize("value", ["red", "x:red", "1:", ":red"])
+    def test_invalid(self, value):
+        with pytest.raises(ValidationError):
+            parse_attr_filters(QueryDict(f"attr={value}"))
+
+
+class TestFacetIndex:
+    def test_indexes_active_lines(self, product_line_factory, attribute_value_factory):
+        red = attribute_value_factory(attribute_value="red")
+        line = product_line_factory(attribute_value=(red,))
+        product_line_factory(is_active=False, attribute_value=(red,))
+
+        assert list(
+            ProductLineFacet.objects.values_list("product_line", "attribute", "value")
+        ) == [(line.pk, red.attribute_id, "red")]
+
+    def test_follows_attribute_changes(
+        self, product_line_factory, attribute_value_factory
+    ):
+        red = attribute_value_factory(attribute_value="red")
+        line = product_line_factory(attribute_value=(red,))
+
+        red.attribute_value = "crimson"
+        red.save()
+        assert ProductLineFacet.objects.get().value == "crimson"
+
+        line.attribute_value.remove(red)
+        assert not ProductLineFacet.objects.exists()
+
+    def test_follows_line_activation(
+        self, product_line_factory, attribute_value_factory
+    ):
+        line = product_line_factory(
+            is_active=False, attribute_value=(attribute_value_factory(),)
+        )
+
+        line.is_active = True
+        line.save()
+
+        assert ProductLineFacet.objects.filter(product_line=line).exists()
+
+
+class TestFacetedListing:
+    endpoint = "/api/product/"
+
+    @pytest.fixture
+    def catalog(
+        self,
+        attribute_factory,
+        attribute_value_factory,
+        product_factory,
+        product_line_factory,
+    ):
+        color, size = attribute_factory.create_batch(2)
+        values = {
+            name: attribute_value_factory(attribute=attribute, attribute_value=name)
+            for attribute, names in ((color, ["red", "blue"]), (size, ["S", "XL"]))
+            for name in names
+        }
+        lines = {
+            "red-s": [("red", "S")],
+            "blue-xl": [("blue", "XL")],
+            # Red and XL, but never on the same line.
+            "split": [("red", "S"), ("blue", "XL")],
+            "plain": [],
+        }
+        for slug, variants in lines.items():
+            product = product_factory(slug=slug)
+            for variant in variants:
+                product_line_factory(
+                    product=product,
+                    attribute_value=[values[name] for name in variant],
+                )
+        return color.pk, size.pk
+
+    def slugs(self, response):
+        assert response.status_code == 200
+        return sorted(p["slug"] for p in json.loads(response.content)["results"])
+
+    def test_single_value(self, catalog, api_client):
+        color, _ = catalog
+
+        response = api_client().get(f"{self.endpoint}?attr={color}:red")
+
+        assert self.slugs(response) == ["red-s", "split"]
+
+    def test_values_of_one_attribute_are_alternatives(self, catalog, api_client):
+        color, _ = catalog
+
+        response = api_client().get(
+            f"{self.endpoint}?attr={color}:red&attr={color}:blue"
+        )
+
+        assert self.slugs(response) == ["blue-xl", "red-s", "split"]
+
+    def test_attributes_match_on_one_line(self, catalog, api_client):
+        color, size = catalog
+
+        response = api_client().get(f"{self.endpoint}?attr={color}:red&attr={size}:XL")
+
+        assert self.slugs(response) == []
+
+    def test_facet_counts(self, catalog, api_client):
+        color, size = catalog
+
+        response = api_client().get(f"{self.endpoint}?attr={size}:S&facets=true")
+
+        body = json.loads(response.content)
+        assert list(body) == ["next", "previous", "results", "facets"]
+        assert body["facets"] == {
+            str(color): {"blue": 1, "red": 2},
+            str(size): {"S": 2, "XL": 1},
+        }
+
+    def test_facet_counts_with_fieldset(self, catalog, api_client):
+        client = api_client()
+
+        full = json.loads(client.get(f"{self.endpoint}?facets=1").content)
+        sparse = json.loads(client.get(f"{self.endpoint}?facets=1&fields=slug").content)
+
+        assert sparse["facets"] == full["facets"]
+
+    def test_category_listing(self, catalog, api_client):
+        color, _ = catalog
+        client = api_client()
+        slug = Product.objects.get(slug="red-s").category.slug
+        category = f"{self.endpoint}category/{slug}/all/"
+
+        assert self.slugs(client.get(f"{category}?attr={color}:red")) == ["red-s"]
+        assert self.slugs(client.get(f"{category}?attr={color}:blue")) == []
+
+    def test_async_listing_matches(self, catalog, api_client):
+        color, _ = catalog
+        client = api_client()
+        query = f"product/?attr={color}:red&facets=true"
+
+        sync = client.get(f"/api/{query}")
+        response = client.get(f"/api/async/{query}")
+
+        assert response.content == sync.content
+        assert response["ETag"] == sync["ETag"]
+
+    def test_etag_covers_counts_outside_the_page(
+        self, catalog, api_client, product_line_factory, attribute_value_factory
+    ):
+        client = api_client()
+        url = f"{self.endpoint}?facets=true&page_size=1"
+        first = client.get(url)
+        assert json.loads(first.content)["results"][0]["slug"] == "plain"
+        assert "Last-Modified" not in first
+
+        product_line_factory(
+            product=Product.objects.get(slug="red-s"),
+            attribute_value=(attribute_value_factory(),),
+        )
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("query, queries", [("attr=1:red", 1), ("facets=1", 2)])
+    def test_queries(
+        self, query, queries, catalog, api_client, django_assert_num_queries
+    ):
+        client = api_client()
+        client.get(f"{self.endpoint}?{query}&page_size=1")
+
+        with django_assert_num_queries(queries):
+            client.get(f"{self.endpoint}?{query}&page_size=2")
+
+    def test_invalid(self, api_client):
+        response = api_client().get(f"{self.endpoint}?attr=red")
+
+        assert response.status_code == 400
+        assert "attr" in json.loads(response.content)
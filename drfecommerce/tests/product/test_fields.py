@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError, connection
+
+from ...product.fields import OrderField
+from ...product.models import ProductImage, ProductLine
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=["memory", "file"])
+def sqlite_database(request):
+    """
+    The in-memory test database, which locks shared-cache tables, or a file
+    database, which locks the whole file.
+    """
+    if request.param == "file":
+        request.getfixturevalue("file_database")
+
+
+class TestOrderField:
+    def test_assigns_next_order_in_group(self, product_line_factory):
+        line = product_line_factory()
+        other = product_line_factory()
+
+        first = ProductImage.objects.create(product_line=line, alternative_text="a")
+        second = ProductImage.objects.create(product_line=line, alternative_text="b")
+        elsewhere = ProductImage.objects.create(
+            product_line=other, alternative_text="c"
+        )
+
+        assert (first.order, second.order, elsewhere.order) == (1, 2, 1)
+        assert ProductImage.objects.get(pk=second.pk).order == 2
+
+    def test_continues_after_explicit_order(
+        self, product_line_factory, product_image_factory
+    ):
+        line = product_line_factory()
+        product_image_factory(product_line=line, order=7)
+
+        image = ProductImage.objects.create(product_line=line, alternative_text="a")
+
+        assert image.order == 8
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_inserts_get_distinct_orders(
+        self, sqlite_database, product_line_factory, monkeypatch
+    ):
+        line = product_line_factory()
+        pre_save = OrderField.pre_save
+
+        def slow_pre_save(self, model_instance, add):
+            # Widen the gap between allocating the order and writing the row.
+            value = pre_save(self, model_instance, add)
+            time.sleep(0.005)
+            return value
+
+        monkeypatch.setattr(OrderField, "pre_save", slow_pre_save)
+        threads, per_thread = 8, 5
+        errors = []
+
+        def insert():
+            try:
+                for _ in range(per_thread):
+                    while True:
+                        try:
+                            ProductImage.objects.create(
+                                product_line_id=line.pk, alternative_text="x"
+                            )
+                            break
+                        except OperationalError:
+                            # SQLite reports lock contention instead of
+                            # waiting when the database is shared in memory.
+                            time.sleep(0.001)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=insert) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert errors == []
+        orders = sorted(
+            ProductImage.objects.filter(product_line=line).values_list(
+                "order", flat=True
+            )
+        )
+        assert orders == list(range(1, threads * per_thread + 1))
+        assert ProductLine.objects.filter(pk=line.pk).exists()
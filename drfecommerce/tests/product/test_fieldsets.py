@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from django.http import QueryDict
+
+from ...product.fieldsets import parse_fieldset
+
+pytestmark = pytest.mark.django_db
+
+FULL = "expand=product_line.product_image,product_line.specification,type_specification"
+
+
+def parse(query):
+    return parse_fieldset(QueryDict(query))
+
+
+class TestParseFieldset:
+    def test_full_representation_by_default(self):
+        assert parse("") is None
+
+    def test_fields_with_nested_path(self):
+        assert parse("fields=slug,name,product_line.price") == {
+            "name": None,
+            "slug": None,
+            "product_line": {"price": None},
+        }
+
+    def test_expand_keeps_plain_fields(self):
+        fields = parse("expand=product_line")
+
+        assert "description" in fields
+        assert "product_image" not in fields["product_line"]
+        assert "sku" in fields["product_line"]
+
+    def test_nested_expand_implies_parent(self):
+        fields = parse("fields=name&expand=product_line.specification")
+
+        assert fields == {
+            "name": None,
+            "product_line": {
+                "price": None,
+                "sku": None,
+                "stock_qty": None,
+                "is_active": None,
+                "specification": {},
+            },
+        }
+
+
+class TestSparseEndpoints:
+    endpoint = "/api/product/"
+
+    @pytest.fixture
+    def catalog_size(self):
+        return 3
+
+    def test_listing_tile(self, catalog, api_client):
+        response = api_client().get(
+            f"{self.endpoint}?fields=name,slug,product_line.price"
+        )
+
+        assert response.status_code == 200
+        results = json.loads(response.content)["results"]
+        assert [list(r) for r in results] == [["name", "slug", "product_line"]] * 3
+        assert results[0]["product_line"][0] == {"price": "10.00"}
+
+    def test_everything_matches_full_representation(self, catalog, api_client):
+        client = api_client()
+
+        full = json.loads(client.get(self.endpoint).content)
+        sparse = json.loads(client.get(f"{self.endpoint}?{FULL}").content)
+
+        assert sparse["results"] == full["results"]
+
+    def test_retrieve(self, catalog, api_client):
+        client = api_client()
+        url = f"{self.endpoint}{catalog[0].slug}/"
+
+        full = json.loads(client.get(url).content)
+        sparse = json.loads(client.get(f"{url}?fields=slug,category_name").content)
+
+        assert sparse == [
+            {"slug": full[0]["slug"], "category_name": full[0]["category_name"]}
+        ]
+
+    @pytest.mark.parametrize(
+        "query, queries",
+        [
+            # Validators and products come from the page query.
+            ("fields=name,slug", 1),
+            # One prefetch per relation asked for.
+            ("fields=name,product_line.price", 2),
+            ("fields=name,product_line.product_image.url", 3),
+            (FULL, 6),
+        ],
+    )
+    def test_prunes_queries(
+        self, query, queries, catalog, api_client, django_assert_num_queries
+    ):
+        with django_assert_num_queries(queries):
+            api_client().get(f"{self.endpoint}?{query}")
+
+    def test_fewer_bytes(self, catalog, api_client):
+        client = api_client()
+
+        full = client.get(self.endpoint)
+        tile = client.get(f"{self.endpoint}?fields=name,slug,product_line.price")
+
+        assert len(tile.content) < len(full.content) / 3
+
+    @pytest.mark.parametrize(
+        "query", ["fields=nope", "fields=product_line.nope", "expand=name"]
+    )
+    def test_invalid(self, query, api_client):
+        response = api_client().get(f"{self.endpoint}?{query}")
+
+        assert response.status_code == 400
@@ -0,0 +1,128 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from ...product.models import Product
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestPriceSummary:
+    def summary(self, product):
+        product = Product.objects.get(pk=product.pk)
+        return product.min_price, product.max_price, product.stock_qty
+
+    def test_follows_active_lines(self, product_factory, product_line_factory):
+        product = product_factory()
+        assert self.summary(product) == (None, None, 0)
+
+        cheap = product_line_factory(product=product, price=5, stock_qty=2)
+        product_line_factory(product=product, price=20, stock_qty=3)
+        product_line_factory(product=product, price=1, is_active=False)
+        assert self.summary(product) == (Decimal("5.00"), Decimal("20.00"), 5)
+
+        cheap.price = 8
+        cheap.save()
+        assert self.summary(product)[0] == Decimal("8.00")
+
+        cheap.delete()
+        assert self.summary(product) == (Decimal("20.00"), Decimal("20.00"), 3)
+
+
+class TestListingFilters:
+    endpoint = "/api/product/"
+
+    @pytest.fixture
+    def catalog(self, product_factory, product_line_factory):
+        lines = {
+            "budget": [(5, 0), (9, 1)],
+            "mid": [(25, 4)],
+            "premium": [(80, 0)],
+            "range": [(10, 2), (90, 2)],
+        }
+        for slug, variants in lines.items():
+            product = product_factory(slug=slug)
+            for price, stock_qty in variants:
+                product_line_factory(product=product, price=price, stock_qty=stock_qty)
+        product_factory(slug="unpriced")
+
+    def slugs(self, client, query):
+        response = client.get(f"{self.endpoint}?{query}")
+        assert response.status_code == 200
+        return [p["slug"] for p in json.loads(response.content)["results"]]
+
+    @pytest.mark.parametrize(
+        "query, slugs",
+        [
+            ("price_min=50", {"premium", "range"}),
+            ("price_max=9", {"budget"}),
+            # Lines at 10 and 90 straddle the range without a line inside it.
+            ("price_min=20&price_max=30", {"mid"}),
+            ("in_stock=true", {"budget", "mid", "range"}),
+            ("in_stock=1&price_min=50", {"range"}),
+            # The line at 5 is out of stock; the one in stock costs 9.
+            ("in_stock=1&price_max=5", set()),
+            ("in_stock=1&price_max=9", {"budget"}),
+        ],
+    )
+    def test_filters(self, query, slugs, catalog, api_client):
+        assert set(self.slugs(api_client(), query)) == slugs
+
+    def test_ordering_by_price(self, catalog, api_client):
+        client = api_client()
+
+        assert self.slugs(client, "ordering=price") == [
+            "budget",
+            "range",
+            "mid",
+            "premium",
+        ]
+        assert self.slugs(client, "ordering=-price&in_stock=true") == [
+            "mid",
+            "range",
+            "budget",
+        ]
+
+    def test_price_ordering_pages(self, catalog, api_client):
+        client = api_client()
+        url = f"{self.endpoint}?ordering=-price&page_size=3"
+
+        first = json.loads(client.get(url).content)
+        second = json.loads(client.get(first["next"]).content)
+        back = json.loads(client.get(second["previous"]).content)
+
+        slugs = [p["slug"] for p in first["results"] + second["results"]]
+        assert slugs == ["premium", "mid", "range", "budget"]
+        assert back["results"] == first["results"]
+
+    @pytest.mark.parametrize("fields", ["", "&fields=slug"])
+    def test_single_query(self, fields, catalog, api_client, django_assert_num_queries):
+        client = api_client()
+        client.get(f"{self.endpoint}?ordering=price&in_stock=1")
+
+        # The next link is built from the page's prices, already loaded.
+        with django_assert_num_queries(1):
+            response = client.get(
+                f"{self.endpoint}?ordering=price&in_stock=1&price_max=50"
+                f"&page_size=1{fields}"
+            )
+        assert json.loads(response.content)["next"]
+
+    @pytest.mark.parametrize(
+        "query", ["price_min=cheap", "price_max=NaN", "ordering=name"]
+    )
+    def test_invalid(self, query, api_client):
+        response = api_client().get(f"{self.endpoint}?{query}")
+
+        assert response.status_code == 400
+        assert query.split("=")[0] in json.loads(response.content)
+
+    def test_async_listing_matches(self, catalog, api_client):
+        client = api_client()
+        query = "product/?ordering=price&in_stock=true&page_size=2"
+
+        sync = client.get(f"/api/{query}")
+        response = client.get(f"/api/async/{query}")
+
+        assert response.content.replace(b"/api/async/", b"/api/") == sync.content
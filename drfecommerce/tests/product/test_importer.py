@@ -0,0 +1,149 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from ...product.importer import CatalogImporter, read_csv, read_jsonl
+from ...product.models import (
+    AttributeValue,
+    Product,
+    ProductDocument,
+    ProductImage,
+    ProductLine,
+)
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def catalog_refs(category_factory, product_type_factory, attribute_factory):
+    category_factory(slug="shoes")
+    product_type_factory(name="shoe")
+    attribute_factory(name="color")
+    attribute_factory(name="size")
+
+
+def make_row(n, pid="P1", **overrides):
+    row = {
+        "pid": pid,
+        "name": f"Product {pid}",
+        "slug": f"product-{pid}",
+        "description": "desc",
+        "category": "shoes",
+        "product_type": "shoe",
+        "sku": f"SKU-{n}",
+        "price": "19.99",
+        "stock_qty": 3,
+        "weight": 1.5,
+        "attributes": {"color": "red", "size": str(n)},
+        "images": ["front.jpg", {"url": "back.jpg", "alternative_text": "back"}],
+    }
+    row.update(overrides)
+    return row
+
+
+class TestCatalogImporter:
+    def test_imports_products_lines_attributes_and_images(self, catalog_refs):
+        rows = [make_row(1), make_row(2), make_row(3, pid="P2")]
+
+        (report,) = CatalogImporter(chunk_size=10).run(rows)
+
+        assert report.errors == []
+        assert (report.products_created, report.lines_created) == (2, 3)
+        lines = ProductLine.objects.filter(product__pid="P1").order_by("order")
+        assert [line.order for line in lines] == [1, 2]
+        assert lines[0].attribute_value.count() == 2
+        assert ProductImage.objects.filter(product_line=lines[0]).count() == 2
+        assert AttributeValue.objects.filter(attribute__name="color").count() == 1
+        document = json.loads(ProductDocument.objects.get(product__pid="P1").document)
+        assert len(document["product_line"]) == 2
+
+    def test_chunks_continue_line_order(self, catalog_refs):
+        rows = [make_row(n) for n in range(5)]
+
+        reports = list(CatalogImporter(chunk_size=2).run(rows))
+
+        assert [r.lines_created for r in reports] == [2, 2, 1]
+        orders = ProductLine.objects.order_by("order").values_list("order", flat=True)
+        assert list(orders) == [1, 2, 3, 4, 5]
+
+    def test_reports_row_errors_and_imports_the_rest(self, catalog_refs):
+        rows = [
+            make_row(1),
+            make_row(2, category="missing"),
+            make_row(3, pid="P3", category="missing"),
+            make_row(4, sku="SKU-1"),
+            make_row(5, price="1.001"),
+            make_row(6, attributes={"weight": "2"}),
+        ]
+
+        (report,) = CatalogImporter().run(rows)
+
+        assert [e.row for e in report.errors] == [3, 4, 5, 6]
+        # Row 2 joins P1, created by row 1, so its unknown category is unused.
+        assert report.lines_created == 2
+        assert not Product.objects.filter(pid="P3").exists()
+
+    @pytest.mark.parametrize(
+        "overrides, message",
+        [
+            ({"attributes": ["color"]}, "attributes must be an object"),
+            ({"images": "front.jpg"}, "images must be a list"),
+            ({"images": [5]}, "each image must be a url or an object"),
+            ({"images": ["x" * 200 + ".jpg"]}, "at most 100 characters"),
+            ({"attributes": {"color": "x" * 101}}, "at most 100 characters"),
+            ({"category": ["shoes"]}, "category must be a single value"),
+        ],
+    )
+    def test_rejects_malformed_rows(self, overrides, message, catalog_refs):
+        rows = [make_row(1, pid="P2", **overrides), make_row(2)]
+
+        (report,) = CatalogImporter().run(rows)
+
+        (error,) = report.errors
+        assert (error.row, message in error.message) == (1, True)
+        assert report.lines_created == 1
+        assert not ProductLine.objects.filter(sku="SKU-1").exists()
+
+    def test_rejects_non_object_lines(self, catalog_refs):
+        lines = ["[1, 2]", '"x"', json.dumps(make_row(1))]
+
+        (report,) = CatalogImporter().run(read_jsonl(io.StringIO("\n".join(lines))))
+
+        assert [e.row for e in report.errors] == [1, 2]
+        assert report.errors[0].message == "expected a JSON object"
+        assert report.lines_created == 1
+
+    def test_constant_queries_per_chunk(
+        self, catalog_refs, django_assert_max_num_queries
+    ):
+        importer = CatalogImporter(chunk_size=100)
+        rows = [make_row(n, pid=f"P{n % 10}") for n in range(100)]
+        # Lookups, writes, and document, facet, search term and prefix index,
+        # price summary and SKU cache updates; independent of chunk size.
+        with django_assert_max_num_queries(47):
+            list(importer.run(rows))
+        assert ProductLine.objects.count() == 100
+
+    def test_readers(self):
+        jsonl = io.StringIO(json.dumps({"sku": "a"}) + "\n\nnot json\n")
+        csv = io.StringIO(
+            "sku,attributes,images\nb,color=red;size=M,front.jpg|back.jpg\n"
+        )
+
+        assert list(read_jsonl(jsonl))[0] == {"sku": "a"}
+        assert "_error" in list(read_jsonl(io.StringIO("not json\n")))[0]
+        (row,) = read_csv(csv)
+        assert row["attributes"] == {"color": "red", "size": "M"}
+        assert row["images"] == ["front.jpg", "back.jpg"]
+
+    def test_management_command(self, catalog_refs, tmp_path):
+        path = tmp_path / "feed.jsonl"
+        path.write_text("\n".join(json.dumps(make_row(n)) for n in range(3)))
+        out = io.StringIO()
+
+        call_command("import_catalog", str(path), chunk_size=2, stdout=out)
+
+        assert "chunk 2: 1 rows" in out.getvalue()
+        assert ProductLine.objects.count() == 3
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def migrate():
+    """
+    Migrate the test database to the given migration and return its app
+    registry; the database is brought back to the latest migration after.
+    """
+
+    def migrate(target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+        executor.loader.build_graph()
+        return executor.loader.project_state([target]).apps
+
+    yield migrate
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+def test_unique_order_constraints_renumber_duplicates(migrate):
+    apps = migrate(("product", "0005_category_tree_range_idx"))
+    Category = apps.get_model("product", "Category")
+    ProductType = apps.get_model("product", "ProductType")
+    Product = apps.get_model("product", "Product")
+    ProductLine = apps.get_model("product", "ProductLine")
+    ProductImage = apps.get_model("product", "ProductImage")
+    # Historical models have no tree manager; fill in a single root node.
+    category = Category.objects.create(
+        name="Shoes", slug="shoes", lft=1, rght=2, tree_id=1, level=0
+    )
+    product_type = ProductType.objects.create(name="shoe")
+    product = Product.objects.create(
+        name="Boot",
+        slug="boot",
+        pid="1",
+        description="",
+        category=category,
+        product_type=product_type,
+    )
+    lines = [
+        ProductLine.objects.create(
+            product=product,
+            product_type=product_type,
+            sku=f"SKU-{n}",
+            price=10,
+            stock_qty=1,
+            weight=1,
+            order=order,
+        )
+        for n, order in enumerate([1, 2, 1, 2, 1])
+    ]
+    for order in [1, 1, 3]:
+        ProductImage.objects.create(
+            product_line=lines[0], alternative_text="", order=order
+        )
+
+    apps = migrate(("product", "0006_unique_order_constraints"))
+
+    line_orders = apps.get_model("product", "ProductLine").objects.order_by("pk")
+    assert list(line_orders.values_list("order", flat=True)) == [1, 2, 3, 4, 5]
+    image_orders = apps.get_model("product", "ProductImage").objects.order_by("pk")
+    assert list(image_orders.values_list("order", flat=True)) == [1, 4, 3]
@@ -1,8 +1,11 @@
+from unittest import mock
+
 from django.db import IntegrityError
 from django.forms import ValidationError
 import pytest
 
 from ...product.models import Product, ProductLine
+from ...product.signals import catalog_changed
 
 pytestmark = pytest.mark.django_db
 
@@ -112,6 +115,45 @@ class TestProductLineModel:
                 product_line=product_line, attribute_value=attr_value_2
             )
 
+    def test_add_attribute_values_in_batch(
+        self,
+        product_line_factory,
+        attribute_value_factory,
+        django_assert_max_num_queries,
+    ):
+        values = attribute_value_factory.create_batch(20)
+        product_line = product_line_factory()
+
+        # Validation, then the existing-ids lookup and insert of add().
+        with django_assert_max_num_queries(3):
+            with mock.patch.object(catalog_changed, "send"):
+                product_line.add_attribute_values(values)
+
+        assert product_line.attribute_value.count() == 20
+
+    def test_add_attribute_values_rejects_same_attribute_twice(
+        self, product_line_factory, attribute_value_factory, attribute_factory
+    ):
+        attr = attribute_factory()
+        product_line = product_line_factory()
+        with pytest.raises(ValidationError):
+            product_line.add_attribute_values(
+                attribute_value_factory.create_batch(2, attribute=attr)
+            )
+        assert product_line.attribute_value.count() == 0
+
+    def test_add_attribute_values_rejects_conflict_with_existing(
+        self, product_line_factory, attribute_value_factory, attribute_factory
+    ):
+        attr = attribute_factory()
+        red, blue = attribute_value_factory.create_batch(2, attribute=attr)
+        product_line = product_line_factory()
+        product_line.add_attribute_values([red])
+
+        product_line.add_attribute_values([red])
+        with pytest.raises(ValidationError):
+            product_line.add_attribute_values([blue])
+
     def test_str_method(self, product_line_factory, attribute_value_factory):
         attr = attribute_value_factory(attribute_value="test_attr")
         obj = product_line_factory(sku="test_product", attribute_value=(attr,))
@@ -125,6 +167,27 @@ class TestProductLineModel:
         with pytest.raises(ValidationError):
             product_line_factory(order=1, product=product).clean()
 
+    def test_duplicate_order_rejected_by_database(
+        self, product_factory, product_line_factory
+    ):
+        product = product_factory()
+        line = product_line_factory(order=1, product=product)
+
+        with pytest.raises(IntegrityError):
+            ProductLine.objects.bulk_create(
+                [
+                    ProductLine(
+                        price=1,
+                        sku="dup",
+                        stock_qty=1,
+                        product=product,
+                        product_type=line.product_type,
+                        order=1,
+                        weight=1,
+                    )
+                ]
+            )
+
     def test_field_decimal_places(self, product_line_factory):
         price = 1.001
         with pytest.raises(ValidationError):
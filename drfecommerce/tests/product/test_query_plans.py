@@ -0,0 +1,98 @@
+import re
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...product.models import Category, Product, ProductLine
+from ...product.summaries import refresh_summaries
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="parses SQLite EXPLAIN QUERY PLAN"
+    ),
+]
+
+# "SCAN <table>" without "USING [COVERING] INDEX" reads every row.
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def query_plans(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@pytest.fixture
+def large_catalog(product_type_factory):
+    product_type = product_type_factory()
+    root = Category.objects.create(name="root", slug="root", is_active=True)
+    categories = [
+        Category.objects.create(name=f"c{n}", slug=f"c{n}", parent=root)
+        for n in range(20)
+    ]
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"p{n}",
+            slug=f"p{n}",
+            pid=f"{n}",
+            description="",
+            category=categories[n % len(categories)],
+            product_type=product_type,
+            is_active=n % 4 != 0,
+        )
+        for n in range(2000)
+    )
+    ProductLine.objects.bulk_create(
+        ProductLine(
+            price=n % 100,
+            sku=f"sku{n}",
+            stock_qty=n % 7,
+            product=products[n % len(products)],
+            product_type=product_type,
+            order=n // len(products) + 1,
+            weight=1,
+        )
+        for n in range(4000)
+    )
+    refresh_summaries(product.pk for product in products)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return products
+
+
+ENDPOINTS = [
+    "/api/category/",
+    "/api/category/tree/",
+    "/api/product/",
+    "/api/product/?page_size=5",
+    "/api/product/p1/",
+    "/api/product/category/c3/all/",
+    "/api/product/category/root/all/?subtree=true",
+    "/api/product/?ordering=price",
+    "/api/product/?ordering=-price&in_stock=true&price_max=50",
+    "/api/product/category/c3/all/?price_min=10",
+]
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_endpoint_queries_avoid_full_scans(url, large_catalog, api_client):
+    client = api_client()
+    # Warm the stored documents so only the read path is audited.
+    client.get(url)
+    caches["catalog"].clear()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+
+    scans = [
+        (detail, query["sql"])
+        for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT")
+        for detail in query_plans(query["sql"])
+        if FULL_SCAN.match(detail)
+    ]
+    assert scans == []
@@ -0,0 +1,45 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from ...product import renderers
+from ...product.renderers import CatalogJSONRenderer
+
+DATA = OrderedDict(
+    [
+        ("price", decimal.Decimal("10.50")),
+        ("created", datetime.datetime(2024, 5, 1, 12, 30, 1, 250, datetime.UTC)),
+        ("day", datetime.date(2024, 5, 1)),
+        ("id", uuid.UUID(int=7)),
+        ("specification", {1: "red", 2: "M"}),
+        ("text", "caf\u00e9 \u2028 \u2029 \U0001f600"),
+        ("lazy", gettext_lazy("lazy")),
+        ("items", [1, 2.5, None, True, []]),
+    ]
+)
+
+
+@pytest.mark.skipif(renderers.orjson is None, reason="orjson is not installed")
+def test_matches_json_renderer():
+    assert CatalogJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+def test_falls_back_when_disabled(settings, monkeypatch):
+    settings.FAST_JSON_RENDERER = False
+    monkeypatch.setattr(renderers, "dumps", None)
+
+    assert CatalogJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+def test_falls_back_for_indented_output(monkeypatch):
+    monkeypatch.setattr(renderers, "dumps", None)
+    media_type = "application/json; indent=2"
+
+    content = CatalogJSONRenderer().render(DATA, media_type)
+
+    assert content == JSONRenderer().render(DATA, media_type)
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from ...product.models import ProductSearchTerm
+from ...product.search import (
+    query_terms,
+    search_prefix,
+    search_products,
+    search_terms,
+    search_word,
+    terms,
+)
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestTerms:
+    def test_normalizes_words(self):
+        assert terms("Crème BRÛLÉE, 2-pack!") == ["creme", "brulee", "2", "pack"]
+
+    def test_query_drops_repeated_words(self):
+        assert query_terms("Shoe shoe red") == ["shoe", "red"]
+
+
+class TestSearch:
+    endpoint = "/api/product/search/"
+
+    @pytest.fixture
+    def catalog(self, category_factory, product_factory):
+        shoes = category_factory(name="Shoes")
+        return {
+            "runner": product_factory(
+                name="Trail Runner", description="A light shoe", category=shoes
+            ),
+            "boot": product_factory(
+                name="Winter Boot", description="Warm and waterproof", category=shoes
+            ),
+            "sock": product_factory(
+                name="Running Sock", description="Goes with any shoe"
+            ),
+        }
+
+    def test_ranks_by_field_weight(self, catalog):
+        # In the runner's description and category name, only in the sock's
+        # description and only in the boot's category name, as a prefix.
+        assert search_products("shoe", 10) == [
+            catalog["runner"].pk,
+            catalog["sock"].pk,
+            catalog["boot"].pk,
+        ]
+
+    def test_ranks_name_over_description(self, product_factory):
+        described = product_factory(description="A desk lamp")
+        named = product_factory(name="Lamp")
+
+        assert search_products("lamp", 10) == [named.pk, described.pk]
+
+    def test_exact_word_ranks_above_prefix(self, product_factory):
+        exact = product_factory(name="Run")
+        prefix = product_factory(name="Runner")
+
+        assert search_products("run", 10) == [exact.pk, prefix.pk]
+
+    @pytest.mark.parametrize("word", ["s", "sh", "shoe", "trail"])
+    def test_prefix_index_ranks_like_terms(self, word, catalog, product_factory):
+        product_factory(name="Shoe shop", description="Shoes, shoe trees, shoehorns")
+        product_factory(name="Shorts", description="Short shorts")
+
+        assert search_prefix(word, 3) == search_terms([], word, 3)
+        assert search_prefix(word, 10) == search_terms([], word, 10)
+
+    @pytest.mark.parametrize("word", ["runner", "runners", "runnin", "trailz"])
+    @pytest.mark.parametrize("limit", [1, 2, 3, 10])
+    def test_word_heads_rank_like_terms(self, word, limit, catalog, product_factory):
+        product_factory(name="Runners", description="Runner runner runners")
+        product_factory(name="Runner", description="For runners")
+        product_factory(name="Running runners")
+
+        ranked = search_word(word, limit)
+        assert ranked is None or ranked == search_terms([], word, limit)
+        assert search_products(word, limit) == search_terms([], word, limit)
+
+    def test_every_word_must_match(self, catalog):
+        assert search_products("winter shoes", 10) == [catalog["boot"].pk]
+        assert search_products("winter sock", 10) == []
+
+    def test_last_word_is_a_prefix(self, catalog):
+        assert search_products("wat", 10) == [catalog["boot"].pk]
+        assert search_products("winter bo", 10) == [catalog["boot"].pk]
+        assert search_products("wint boot", 10) == []
+
+    def test_follows_catalog_changes(self, catalog):
+        boot = catalog["boot"]
+        boot.name = "Snow Boot"
+        boot.save()
+
+        assert search_products("winter", 10) == []
+        assert search_products("snow", 10) == [boot.pk]
+
+        boot.is_active = False
+        boot.save()
+        assert not ProductSearchTerm.objects.filter(product=boot).exists()
+
+    def test_unchanged_text_is_not_rewritten(self, catalog, product_line_factory):
+        runner = catalog["runner"]
+        rows = ProductSearchTerm.objects.filter(product=runner).values_list("pk")
+
+        before = set(rows)
+        product_line_factory(product=runner)
+        runner.save()
+
+        assert set(rows) == before
+
+    def test_follows_category_rename(self, catalog):
+        category = catalog["boot"].category
+        category.name = "Footwear"
+        category.save()
+
+        assert len(search_products("footwear", 10)) == 2
+
+    def test_endpoint_returns_documents(self, catalog, api_client):
+        client = api_client()
+
+        response = client.get(f"{self.endpoint}?q=Winter%20Bo")
+
+        assert response.status_code == 200
+        detail = json.loads(client.get(f"/api/product/{catalog['boot'].slug}/").content)
+        assert json.loads(response.content) == {"results": detail}
+
+    def test_endpoint_limit(self, catalog, api_client, django_assert_num_queries):
+        client = api_client()
+        client.get(f"{self.endpoint}?q=shoe")
+
+        # The prefix index's best products, then the documents.
+        with django_assert_num_queries(2):
+            response = client.get(f"{self.endpoint}?q=shoe&page_size=2")
+
+        slugs = [p["slug"] for p in json.loads(response.content)["results"]]
+        assert slugs == [catalog["runner"].slug, catalog["sock"].slug]
+
+    @pytest.mark.parametrize("query", ["", "q=", "q=%21%3F"])
+    def test_no_words(self, query, catalog, api_client):
+        response = api_client().get(f"{self.endpoint}?{query}")
+
+        if query:
+            assert json.loads(response.content) == {"results": []}
+        else:
+            assert response.status_code == 400
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from ...product.models import Product
+from ...product.serializers import ProductSerializer, serialize_product
+
+pytestmark = pytest.mark.django_db
+
+
+class TestProductSerializer:
+    def serialize_all(self):
+        queryset = (
+            Product.objects.all()
+            .select_related("category")
+            .prefetch_related("product_line", "product_type__attribute")
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            data = ProductSerializer(queryset, many=True).data
+        return data, len(ctx.captured_queries)
+
+    def test_attributes_constant_queries(
+        self, product_factory, product_type_factory, attribute_factory
+    ):
+        product_type = product_type_factory(attribute=attribute_factory.create_batch(3))
+        product_factory.create_batch(2, product_type=product_type)
+        _, few = self.serialize_all()
+
+        product_factory.create_batch(8, product_type=product_type_factory())
+        data, many = self.serialize_all()
+
+        assert len(data) == 10
+        assert few == many
+
+    def test_attributes_type_specification(
+        self, product_factory, product_type_factory, attribute_factory
+    ):
+        attr = attribute_factory(name="color")
+        product_factory(product_type=product_type_factory(attribute=(attr,)))
+
+        data, _ = self.serialize_all()
+
+        assert data[0]["type specification"] == {attr.id: "color"}
+
+
+class TestSerializeProduct:
+    def test_renders_identically_to_product_serializer(
+        self,
+        product_factory,
+        product_line_factory,
+        product_image_factory,
+        product_type_factory,
+        attribute_factory,
+        attribute_value_factory,
+    ):
+        attributes = attribute_factory.create_batch(2)
+        product = product_factory(
+            product_type=product_type_factory(attribute=attributes)
+        )
+        product_factory()
+        for price, is_active in [("10.5", True), ("0.01", False), ("1234567.89", True)]:
+            line = product_line_factory(
+                product=product, price=price, is_active=is_active
+            )
+            product_image_factory.create_batch(2, product_line=line)
+            line.attribute_value.add(
+                attribute_value_factory(attribute=attributes[0]),
+                attribute_value_factory(attribute=attributes[1]),
+            )
+
+        renderer = JSONRenderer()
+        for product in Product.objects.for_api():
+            assert renderer.render(serialize_product(product)) == renderer.render(
+                ProductSerializer(product).data
+            )
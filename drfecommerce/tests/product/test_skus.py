@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from django.db import transaction
+
+from ...product.models import ProductLine
+from ...product.skus import MAX_SKUS, lookup_skus, sku_cache, sku_key
+from ...product.stock import reserve_stock
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestSkuLookup:
+    endpoint = "/api/sku/"
+
+    @pytest.fixture
+    def lines(self, product_line_factory):
+        return product_line_factory.create_batch(3, price=12.5, stock_qty=4)
+
+    def lookup(self, client, skus):
+        response = client.get(f"{self.endpoint}?sku={','.join(skus)}")
+        assert response.status_code == 200
+        return json.loads(response.content)
+
+    def test_returns_requested_skus_in_order(self, lines, api_client):
+        skus = [lines[2].sku, "missing", lines[0].sku]
+
+        assert self.lookup(api_client(), skus) == [
+            {"sku": lines[2].sku, "price": "12.50", "stock_qty": 4, "is_active": True},
+            {"sku": lines[0].sku, "price": "12.50", "stock_qty": 4, "is_active": True},
+        ]
+
+    def test_one_query_then_cached(
+        self, product_factory, api_client, django_assert_num_queries
+    ):
+        product = product_factory()
+        lines = ProductLine.objects.bulk_create(
+            ProductLine(
+                price=1,
+                sku=f"bulk{n}",
+                stock_qty=1,
+                product=product,
+                product_type=product.product_type,
+                order=n,
+                weight=1,
+            )
+            for n in range(200)
+        )
+        skus = [line.sku for line in lines]
+        client = api_client()
+
+        with django_assert_num_queries(1):
+            assert len(self.lookup(client, skus)) == 200
+        with django_assert_num_queries(0):
+            assert len(self.lookup(client, skus[::-1])) == 200
+        # Only the SKUs not cached yet are loaded.
+        with django_assert_num_queries(1):
+            self.lookup(client, [*skus, "missing"])
+
+    def test_invalidated_by_line_save(self, lines, api_client):
+        client = api_client()
+        self.lookup(client, [lines[0].sku])
+
+        lines[0].price = 20
+        lines[0].save()
+
+        assert self.lookup(client, [lines[0].sku])[0]["price"] == "20.00"
+
+    def test_invalidated_by_stock_reservation(
+        self, lines, api_client, django_capture_on_commit_callbacks
+    ):
+        client = api_client()
+        self.lookup(client, [lines[0].sku])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reserve_stock({lines[0].sku: 3})
+
+        assert self.lookup(client, [lines[0].sku])[0]["stock_qty"] == 1
+
+    def test_invalidated_by_line_delete(self, lines, api_client):
+        client = api_client()
+        self.lookup(client, [lines[0].sku])
+
+        ProductLine.objects.filter(pk=lines[0].pk).get().delete()
+
+        assert self.lookup(client, [lines[0].sku]) == []
+
+    def test_invalidated_by_sku_rename(self, lines, api_client):
+        client = api_client()
+        old_sku = lines[0].sku
+        self.lookup(client, [old_sku])
+
+        lines[0].sku = "renamed"
+        lines[0].save()
+
+        assert self.lookup(client, [old_sku]) == []
+        assert [item["sku"] for item in self.lookup(client, ["renamed"])] == ["renamed"]
+
+    def test_delete_invalidates_on_commit(self, lines):
+        lookup_skus([lines[0].sku])
+        key = sku_key(lines[0].sku)
+
+        with transaction.atomic():
+            ProductLine.objects.get(pk=lines[0].pk).delete()
+            assert sku_cache().get(key) is not None
+
+        assert sku_cache().get(key) is None
+
+    @pytest.mark.parametrize("query", ["", f"sku={','.join(['x'] * 2)}"])
+    def test_duplicates_and_missing_param(self, query, lines, api_client):
+        response = api_client().get(f"{self.endpoint}?{query}")
+
+        if query:
+            assert json.loads(response.content) == []
+        else:
+            assert response.status_code == 400
+
+    def test_too_many(self, api_client):
+        skus = ",".join(f"s{n}" for n in range(MAX_SKUS + 1))
+
+        response = api_client().get(f"{self.endpoint}?sku={skus}")
+
+        assert response.status_code == 400
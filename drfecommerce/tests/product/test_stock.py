@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+from django.db import OperationalError, connection
+
+from ...product.models import ProductDocument, ProductLine
+from ...product.stock import InsufficientStock, release_stock, reserve_stock
+
+pytestmark = pytest.mark.django_db
+
+
+def stock(*lines):
+    return [ProductLine.objects.get(pk=line.pk).stock_qty for line in lines]
+
+
+class TestReserveStock:
+    def test_decrements_batch(self, product_line_factory):
+        a = product_line_factory(stock_qty=5)
+        b = product_line_factory(stock_qty=2)
+
+        reserve_stock({a.sku: 3, b.sku: 2})
+
+        assert stock(a, b) == [2, 0]
+
+    def test_all_or_nothing(self, product_line_factory):
+        a = product_line_factory(stock_qty=5)
+        b = product_line_factory(stock_qty=1)
+        inactive = product_line_factory(stock_qty=9, is_active=False)
+
+        with pytest.raises(InsufficientStock) as excinfo:
+            reserve_stock({a.sku: 1, b.sku: 2, inactive.sku: 1, "missing": 1})
+
+        assert excinfo.value.skus == sorted([b.sku, inactive.sku, "missing"])
+        assert stock(a, b, inactive) == [5, 1, 9]
+
+    def test_single_statement_per_sku(
+        self, product_line_factory, django_assert_num_queries
+    ):
+        lines = product_line_factory.create_batch(3, stock_qty=5)
+
+        # The savepoint, one UPDATE per SKU, the product lookup for
+        # catalog_changed (sent on commit) and the savepoint release.
+        with django_assert_num_queries(6):
+            reserve_stock({line.sku: 1 for line in lines})
+
+    @pytest.mark.parametrize("quantity", [0, -1, 1.5, True])
+    def test_invalid_quantity(self, quantity, product_line_factory):
+        line = product_line_factory(stock_qty=5)
+
+        with pytest.raises(ValueError):
+            reserve_stock({line.sku: quantity})
+
+    def test_release(self, product_line_factory):
+        line = product_line_factory(stock_qty=5)
+
+        reserve_stock({line.sku: 4})
+        release_stock({line.sku: 3})
+
+        assert stock(line) == [4]
+
+    def test_updates_document(
+        self, product_line_factory, django_capture_on_commit_callbacks
+    ):
+        line = product_line_factory(stock_qty=5)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reserve_stock({line.sku: 2})
+
+        document = ProductDocument.objects.get(product=line.product).document
+        assert '"stock_qty":3' in document
+
+
+@pytest.mark.django_db(transaction=True)
+def test_no_oversell_under_concurrency(product_line_factory):
+    lines = product_line_factory.create_batch(3, stock_qty=40)
+    skus = [line.sku for line in lines]
+    threads, attempts = 16, 20
+    reserved = []
+    errors = []
+    start = threading.Barrier(threads)
+
+    def reserve(batch):
+        while True:
+            try:
+                reserve_stock(batch)
+                return True
+            except InsufficientStock:
+                return False
+            except OperationalError as exc:
+                # The in-memory test database locks whole tables instead of
+                # waiting for them; retry as a client would, the transaction
+                # has rolled back.
+                if "locked" not in str(exc):
+                    raise
+
+    def checkout(n):
+        start.wait()
+        try:
+            for i in range(attempts):
+                # Overlapping batches, in varying order.
+                batch = {skus[(n + i) % 3]: 1, skus[(n + i + 1) % 3]: 2}
+                if reserve(batch):
+                    reserved.append(batch)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=checkout, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    remaining = dict(ProductLine.objects.values_list("sku", "stock_qty"))
+    for sku in skus:
+        taken = sum(batch.get(sku, 0) for batch in reserved)
+        assert remaining[sku] == 40 - taken
+        assert remaining[sku] >= 0
+    # Demand (16 * 20 * 3 units) is well above the 120 units in stock, and
+    # every thread ends on each batch shape, which failed only if it no longer
+    # fitted; stock only goes down, so none fits now.
+    shapes = [{skus[n % 3]: 1, skus[(n + 1) % 3]: 2} for n in range(3)]
+    for shape in shapes:
+        assert any(remaining[sku] < quantity for sku, quantity in shape.items())
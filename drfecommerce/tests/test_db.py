@@ -0,0 +1,190 @@
+import json
+import sqlite3
+
+import pytest
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from ..db import (
+    PIN_COOKIE,
+    PrimaryPinMiddleware,
+    PrimaryReplicaRouter,
+    RoutingState,
+    _state,
+)
+from ..product.models import Category, ProductDocument
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+
+
+def queries_by_alias(client, *args, **kwargs):
+    with CaptureQueriesContext(connections["default"]) as primary:
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = client.get(*args, **kwargs)
+    return response, len(primary), len(replica)
+
+
+class TestPrimaryReplicaRouter:
+    router = PrimaryReplicaRouter()
+
+    def route(self, **state):
+        token = _state.set(RoutingState(**state))
+        try:
+            return self.router.db_for_read(Category)
+        finally:
+            _state.reset(token)
+
+    def test_reads_outside_requests_use_primary(self):
+        assert self.router.db_for_read(Category) == "default"
+
+    def test_reads_use_replica_when_allowed(self):
+        assert self.route(replica_reads=True) == "replica"
+
+    def test_pinned_reads_use_primary(self):
+        assert self.route(replica_reads=True, pinned=True) == "default"
+
+    def test_reads_without_replicas_use_primary(self, settings):
+        settings.DATABASE_REPLICAS = []
+        assert self.route(replica_reads=True) == "default"
+
+    def test_reads_in_transaction_use_primary(self):
+        with transaction.atomic():
+            assert self.route(replica_reads=True) == "default"
+
+    def test_write_pins_the_rest_of_the_request(self):
+        state = RoutingState(replica_reads=True)
+        token = _state.set(state)
+        try:
+            assert self.router.db_for_write(Category) == "default"
+            assert self.router.db_for_read(Category) == "default"
+        finally:
+            _state.reset(token)
+        assert state.wrote
+
+
+class TestPrimaryPinMiddleware:
+    def test_write_sets_pin_cookie(self, settings):
+        settings.REPLICA_PIN_SECONDS = 7
+
+        def view(request):
+            Category.objects.create(name="c", slug="c")
+            return HttpResponse()
+
+        response = PrimaryPinMiddleware(view)(RequestFactory().post("/"))
+
+        assert response.cookies[PIN_COOKIE]["max-age"] == 7
+
+    def test_read_does_not_set_pin_cookie(self):
+        def view(request):
+            list(Category.objects.all())
+            return HttpResponse()
+
+        response = PrimaryPinMiddleware(view)(RequestFactory().get("/"))
+
+        assert PIN_COOKIE not in response.cookies
+
+
+class TestCatalogReads:
+    @pytest.fixture
+    def catalog(self, product_factory, product_line_factory, api_client):
+        product = product_factory(slug="replica")
+        product_line_factory(product=product)
+        # Build the stored documents, which is a write.
+        api_client().get("/api/product/")
+        caches["catalog"].clear()
+
+    @pytest.mark.parametrize(
+        "url", ["/api/category/", "/api/product/", "/api/product/replica/"]
+    )
+    def test_get_reads_from_replica(self, url, catalog, api_client):
+        response, primary, replica = queries_by_alias(api_client(), url)
+
+        assert response.status_code == 200
+        assert primary == 0
+        assert replica > 0
+
+    def test_pinned_client_reads_from_primary(self, catalog, api_client):
+        client = api_client()
+        client.cookies[PIN_COOKIE] = "1"
+
+        response, primary, replica = queries_by_alias(client, "/api/product/")
+
+        assert response.status_code == 200
+        assert primary > 0
+        assert replica == 0
+
+    def test_admin_reads_from_primary(self, api_client):
+        response, primary, replica = queries_by_alias(api_client(), "/admin/login/")
+
+        assert response.status_code == 200
+        assert replica == 0
+
+
+class TestLaggingReplica:
+    @pytest.fixture
+    def replicate(self, tmp_path):
+        """
+        Point the replica at its own SQLite file, which only catches up with
+        the primary when the returned function is called.
+        """
+        path = tmp_path / "replica.sqlite3"
+        original = connections.settings["replica"]
+        mirror = connections["replica"]
+        connections.settings["replica"] = {**original, "NAME": str(path)}
+        connections["replica"] = connections.create_connection("replica")
+
+        def replicate():
+            connections["replica"].close()
+            connections["default"].ensure_connection()
+            with sqlite3.connect(path) as target:
+                connections["default"].connection.backup(target)
+            target.close()
+
+        replicate()
+        try:
+            yield replicate
+        finally:
+            connections["replica"].close()
+            connections.settings["replica"] = original
+            connections["replica"] = mirror
+
+    def names(self, client):
+        response = client.get("/api/product/")
+        assert response.status_code == 200
+        return [product["name"] for product in json.loads(response.content)["results"]]
+
+    def test_cached_lagging_reads_expire_with_the_pin(
+        self, settings, replicate, product_factory, api_client
+    ):
+        settings.REPLICA_PIN_SECONDS = 0
+        product = product_factory(name="Old")
+        replicate()
+        client = api_client()
+        assert self.names(client) == ["Old"]
+
+        product.name = "New"
+        product.save()
+
+        assert self.names(client) == ["Old"]
+        replicate()
+        assert self.names(client) == ["New"]
+
+    def test_missing_document_is_built_from_the_primary(
+        self, replicate, product_factory, api_client
+    ):
+        product = product_factory(name="Old")
+        ProductDocument.objects.all().delete()
+        replicate()
+        product.name = "New"
+        product.save()
+
+        assert self.names(api_client()) == ["New"]
+        assert json.loads(ProductDocument.objects.get().document)["name"] == "New"
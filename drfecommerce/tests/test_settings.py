@@ -0,0 +1,37 @@
+from ..settings.database import database_config, databases
+
+
+def test_persistent_connections_by_default():
+    config = database_config({}, "db.sqlite3")
+
+    assert config["NAME"] == "db.sqlite3"
+    assert config["CONN_MAX_AGE"] == 60
+    assert config["CONN_HEALTH_CHECKS"] is True
+
+
+def test_connection_settings_from_environment():
+    config = database_config(
+        {
+            "DATABASE_NAME": "shop",
+            "DATABASE_HOST": "db",
+            "DATABASE_CONN_MAX_AGE": "0",
+            "DATABASE_CONN_HEALTH_CHECKS": "false",
+        },
+        "db.sqlite3",
+    )
+
+    assert config["NAME"] == "shop"
+    assert config["HOST"] == "db"
+    assert config["CONN_MAX_AGE"] == 0
+    assert config["CONN_HEALTH_CHECKS"] is False
+
+
+def test_replica_hosts():
+    config = databases(
+        {"DATABASE_HOST": "primary", "DATABASE_REPLICA_HOSTS": "r1, r2,"},
+        "db.sqlite3",
+    )
+
+    assert list(config) == ["default", "replica1", "replica2"]
+    assert config["replica2"]["HOST"] == "r2"
+    assert config["replica2"]["TEST"] == {"MIRROR": "default"}
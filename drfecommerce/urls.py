@@ -2,17 +2,21 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from drfecommerce.product import views
+from drfecommerce.product import async_views, views
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 router = DefaultRouter()
 router.register(r"category", views.CategoryViewSet)
 router.register(r"product", views.ProductViewSet)
+router.register(r"sku", views.SkuViewSet)
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include(router.urls)),
+    path("api/async/category/", async_views.category_list),
+    path("api/async/product/", async_views.product_list),
+    path("api/async/product/<slug:slug>/", async_views.product_detail),
     path("api/schema", SpectacularAPIView.as_view(), name="schema"),
     path("api/schema/docs", SpectacularSwaggerView.as_view(url_name="schema")),
 ]